@@ -0,0 +1,22 @@
+"""
+Backfill the book_category / book_author tables from the JSON columns on book.
+
+Usage: PYTHONPATH=src python scripts/backfill_book_terms.py [batch_size]
+"""
+import sys
+
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.services import catalog
+
+batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+# Creates book_category / book_author on databases that predate them
+Base.metadata.create_all(bind=engine)
+
+db = SessionLocal()
+try:
+    processed = catalog.rebuild_book_terms(db, batch_size=batch_size)
+    print(f"Backfilled categories and authors for {processed} books.")
+finally:
+    db.close()
@@ -0,0 +1,41 @@
+"""
+Add and backfill book.effective_price plus the indexes that use it, on databases
+created before the column existed. Safe to re-run.
+
+Usage: PYTHONPATH=src python scripts/backfill_effective_price.py [batch_size]
+"""
+import sys
+
+from sqlalchemy import func, inspect, text
+
+from app.db.session import SessionLocal, engine
+from app.models.book import Book
+
+batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+if "effective_price" not in {c["name"] for c in inspect(engine).get_columns("book")}:
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE book ADD COLUMN effective_price INTEGER NOT NULL DEFAULT 0"))
+
+# Recompute in primary-key ranges so each UPDATE holds its locks briefly
+db = SessionLocal()
+try:
+    max_id = db.query(func.max(Book.book_id)).scalar() or 0
+    updated = 0
+    for start in range(0, max_id, batch_size):
+        updated += (
+            db.query(Book)
+            .filter(Book.book_id > start, Book.book_id <= start + batch_size)
+            .update(
+                {Book.effective_price: Book.price * (100 - func.coalesce(Book.discount_rate, 0)) // 100},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    print(f"Recomputed effective_price for {updated} books.")
+finally:
+    db.close()
+
+for index in Book.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
+print("Book indexes are in place.")
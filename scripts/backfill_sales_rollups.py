@@ -0,0 +1,23 @@
+"""
+Rebuild the sales rollup tables (sales_daily, sales_book_daily,
+sales_category_daily) from order history in one streaming pass.
+
+Usage: PYTHONPATH=src python scripts/backfill_sales_rollups.py [batch_size]
+"""
+import sys
+
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.services import sales
+
+batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+# Creates the rollup tables on databases that predate them
+Base.metadata.create_all(bind=engine)
+
+db = SessionLocal()
+try:
+    days = sales.rebuild(db, batch_size=batch_size)
+    print(f"Rebuilt sales rollups for {days} days.")
+finally:
+    db.close()
@@ -0,0 +1,112 @@
+"""
+Concurrency benchmark for POST /orders: fires parallel single-unit orders at one
+book with limited stock and checks that nothing is oversold.
+
+Creates a throwaway user and book directly in the configured database, so run it
+against the same database the server under test uses (MySQL for meaningful
+numbers; SQLite serializes writers).
+
+Usage: PYTHONPATH=src python scripts/bench_order_concurrency.py \
+           [--base-url http://localhost:8000] [--orders 500] [--stock 100] [--workers 32]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import httpx
+from sqlalchemy import func
+
+import app.db.base # noqa: F401 (registers every model)
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db.session import SessionLocal
+from app.models.book import Book, BookStatus
+from app.models.order_item import OrderItem
+from app.models.user import User, UserRole, UserStatus
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--base-url", default="http://localhost:8000")
+parser.add_argument("--orders", type=int, default=500)
+parser.add_argument("--stock", type=int, default=100)
+parser.add_argument("--workers", type=int, default=32)
+args = parser.parse_args()
+
+run_id = uuid.uuid4().hex[:8]
+db = SessionLocal()
+user = User(
+    email=f"bench_{run_id}@example.com",
+    password=get_password_hash("password"),
+    name="Order Bench",
+    birth_date=datetime(1990, 1, 1),
+    gender="MALE",
+    phone_number=f"bench-{run_id}",
+    role=UserRole.USER,
+    status=UserStatus.ACTIVE,
+)
+book = Book(
+    title=f"Flash Sale {run_id}",
+    authors='["Bench"]',
+    categories='["Bench"]',
+    publisher="Bench",
+    isbn=f"bench-{run_id}",
+    price=10000,
+    stock=args.stock,
+    publication_date=datetime(2024, 1, 1),
+    subcategory="Bench",
+    status=BookStatus.AVAILABLE,
+)
+db.add_all([user, book])
+db.commit()
+book_id = book.book_id
+headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+payload = {
+    "items": [{"book_id": book_id, "quantity": 1, "unit_price": 10000, "subtotal": 10000}],
+    "payment_method": "CARD",
+    "receiver_name": "Bench",
+    "receiver_phone": "010-0000-0000",
+    "shipping_address": "Bench",
+}
+url = f"{args.base_url}{settings.API_V1_STR}/orders/"
+
+# One pooled connection per worker
+client = httpx.Client(timeout=30, limits=httpx.Limits(max_connections=args.workers))
+
+
+def place_order(_: int):
+    start = time.perf_counter()
+    status = client.post(url, headers=headers, json=payload).status_code
+    return status, time.perf_counter() - start
+
+
+started = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.workers) as pool:
+    results = list(pool.map(place_order, range(args.orders)))
+elapsed = time.perf_counter() - started
+client.close()
+
+succeeded = sum(1 for status, _ in results if status == 200)
+rejected = sum(1 for status, _ in results if status == 400)
+errors = len(results) - succeeded - rejected
+latencies = sorted(latency for _, latency in results)
+
+db.expire_all()
+final_stock = db.query(Book.stock).filter(Book.book_id == book_id).scalar()
+units_sold = db.query(func.coalesce(func.sum(OrderItem.quantity), 0)).filter(OrderItem.book_id == book_id).scalar()
+db.close()
+
+print(f"{args.orders} orders, {args.workers} workers, stock {args.stock}: {elapsed:.2f}s "
+      f"({len(results) / elapsed:.1f} req/s)")
+print(f"  succeeded {succeeded}, out of stock {rejected}, other errors {errors}")
+print(f"  latency p50 {statistics.median(latencies) * 1000:.1f}ms, "
+      f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms")
+print(f"  final stock {final_stock}, units sold {units_sold}")
+
+oversold = final_stock < 0 or units_sold > args.stock or final_stock != args.stock - units_sold or units_sold != succeeded
+if oversold:
+    print("FAIL: stock and orders disagree (oversell or lost update)")
+    sys.exit(1)
+print("OK: no oversell")
@@ -0,0 +1,137 @@
+"""
+Orders/sec of the direct path (one transaction per order, as POST /orders does
+by default) against group-commit ingestion (app/services/order_queue.py), with
+the same parallel callers placing single-unit orders on a handful of books.
+
+Runs in-process against the configured database, without HTTP in between, so
+the difference is the transaction and commit cost; use MySQL for meaningful
+numbers (SQLite serializes writers and fakes savepoint-in-transaction).
+
+Usage: PYTHONPATH=src python scripts/bench_order_ingest.py \
+           [--orders 2000] [--workers 32] [--books 10] [--max-batch 50] [--max-wait-ms 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import func
+
+import app.db.base # noqa: F401 (registers every model)
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from app.models.book import Book, BookStatus
+from app.models.order import Order
+from app.models.user import User, UserRole, UserStatus
+from app.schemas.order import OrderCreate
+from app.services.order_queue import OrderQueue
+from app.services.ordering import orders_committed, place_order
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--orders", type=int, default=2000)
+parser.add_argument("--workers", type=int, default=32)
+parser.add_argument("--books", type=int, default=10)
+parser.add_argument("--max-batch", type=int, default=50)
+parser.add_argument("--max-wait-ms", type=int, default=5)
+args = parser.parse_args()
+
+run_id = uuid.uuid4().hex[:8]
+db = SessionLocal()
+user = User(
+    email=f"ingest_{run_id}@example.com",
+    password=get_password_hash("password"),
+    name="Ingest Bench",
+    birth_date=datetime(1990, 1, 1),
+    gender="MALE",
+    phone_number=f"ingest-{run_id}",
+    role=UserRole.USER,
+    status=UserStatus.ACTIVE,
+)
+books = [
+    Book(
+        title=f"Ingest Bench {run_id} {i}",
+        authors='["Bench"]',
+        categories='["Bench"]',
+        publisher="Bench",
+        isbn=f"ingest-{run_id}-{i}",
+        price=10000,
+        stock=2 * args.orders, # enough for both runs
+        publication_date=datetime(2024, 1, 1),
+        subcategory="Bench",
+        status=BookStatus.AVAILABLE,
+    )
+    for i in range(args.books)
+]
+db.add(user)
+db.add_all(books)
+db.commit()
+user_id = user.user_id
+book_ids = [book.book_id for book in books]
+
+
+def order(i: int) -> OrderCreate:
+    return OrderCreate(
+        items=[{"book_id": book_ids[i % len(book_ids)], "quantity": 1, "unit_price": 10000, "subtotal": 10000}],
+        payment_method="CARD",
+        receiver_name="Bench",
+        receiver_phone="010-0000-0000",
+        shipping_address="Bench",
+    )
+
+
+def direct(i: int) -> None:
+    session = SessionLocal()
+    try:
+        db_order = place_order(session, user_id, order(i))
+        session.commit()
+        orders_committed([db_order])
+    finally:
+        session.close()
+
+
+ingest = OrderQueue(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+
+
+def queued(i: int) -> None:
+    ingest.submit(db, user_id, order(i))
+
+
+def run(name: str, place: Callable[[int], None]) -> float:
+    latencies: List[float] = []
+
+    def timed(i: int) -> None:
+        start = time.perf_counter()
+        place(i)
+        latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(timed, range(args.orders)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(f"{name:>7}: {args.orders} orders in {elapsed:.2f}s ({args.orders / elapsed:.1f} orders/s), "
+          f"latency p50 {statistics.median(latencies) * 1000:.1f}ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms")
+    return args.orders / elapsed
+
+
+print(f"{args.workers} workers, {args.books} books, batches of up to {args.max_batch} / {args.max_wait_ms}ms")
+direct_rate = run("direct", direct)
+queued_rate = run("queued", queued)
+stats = ingest.stats()
+print(f"  queued path: {stats['batches']} batches, avg {stats['avgBatchSize']} orders per batch")
+print(f"  speedup {queued_rate / direct_rate:.2f}x")
+
+db.expire_all()
+placed = db.query(func.count(Order.order_id)).filter(Order.user_id == user_id).scalar()
+stock_left = db.query(func.sum(Book.stock)).filter(Book.book_id.in_(book_ids)).scalar()
+db.close()
+expected_stock = len(book_ids) * 2 * args.orders - 2 * args.orders
+if placed != 2 * args.orders or stock_left != expected_stock:
+    print(f"FAIL: {placed} orders placed, stock left {stock_left} (expected {2 * args.orders}, {expected_stock})")
+    sys.exit(1)
+print("OK: every order placed once, stock consistent")
@@ -0,0 +1,33 @@
+"""
+Run EXPLAIN for the hot endpoint queries against the configured (seeded) database
+and flag full table scans and unindexed sorts. Exits non-zero when anything is
+flagged, so it can gate CI.
+
+Usage: PYTHONPATH=src python scripts/index_advisor.py [-v]
+"""
+import sys
+
+import app.db.base # noqa: F401 (registers every model)
+from app.db.index_advisor import advise
+from app.db.session import SessionLocal
+
+verbose = "-v" in sys.argv[1:]
+
+db = SessionLocal()
+try:
+    report = advise(db)
+finally:
+    db.close()
+
+flagged = 0
+for name, (plan, problems) in report.items():
+    print(f"{'FLAG' if problems else 'ok  '} {name}")
+    for problem in problems:
+        print(f"       ! {problem}")
+    if verbose or problems:
+        for line in plan:
+            print(f"       {line}")
+    flagged += bool(problems)
+
+print(f"\n{flagged} of {len(report)} queries flagged.")
+sys.exit(1 if flagged else 0)
@@ -0,0 +1,14 @@
+"""
+Delete expired Idempotency-Key records (run periodically, e.g. hourly from cron).
+
+Usage: PYTHONPATH=src python scripts/purge_idempotency_keys.py
+"""
+import app.db.base # noqa: F401 (registers every model)
+from app.db.session import SessionLocal
+from app.services import idempotency
+
+db = SessionLocal()
+try:
+    print(f"Purged {idempotency.purge_expired(db)} expired idempotency keys.")
+finally:
+    db.close()
@@ -0,0 +1,24 @@
+"""
+Report book stock drift left by orders canceled without returning their items
+to stock, and optionally repair it.
+
+Usage: PYTHONPATH=src python scripts/reconcile_stock.py [--apply]
+"""
+import sys
+
+import app.db.base # noqa: F401 (registers every model)
+from app.db.session import SessionLocal
+from app.services import stock
+
+apply = "--apply" in sys.argv[1:]
+
+db = SessionLocal()
+try:
+    drift = stock.stock_drift(db)
+    for row in drift:
+        print(f"book {row['book_id']}: stock {row['stock']}, expected {row['expected_stock']} (+{row['drift']})")
+    print(f"{len(drift)} books drifted, {sum(row['drift'] for row in drift)} units missing.")
+    if apply and drift:
+        print(f"Repaired {stock.repair_drift(db)} books.")
+finally:
+    db.close()
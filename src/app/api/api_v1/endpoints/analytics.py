@@ -0,0 +1,38 @@
+from datetime import date
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.db.session import get_db
+from app.models.user import User, UserRole
+from app.schemas.sales import SalesReport
+from app.services import sales
+
+router = APIRouter()
+
+@router.get("/sales", response_model=SalesReport, response_model_exclude_none=True)
+def read_sales(
+    db: Session = Depends(get_db),
+    group_by: str = Query("day", pattern="^(day|book|category)$"),
+    date_from: Optional[date] = Query(None, description="First day (inclusive)"),
+    date_to: Optional[date] = Query(None, description="Last day (inclusive)"),
+    limit: int = Query(20, ge=1, le=1000, description="Top books/categories by revenue"),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Revenue and units per day, book or category (Admin only).
+
+    Reads only the sales rollup tables, so the cost depends on the number of
+    days and books in range, not on the number of orders. Canceled orders are excluded.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return {
+        "group_by": group_by,
+        "date_from": date_from,
+        "date_to": date_to,
+        "rows": sales.report(db, group_by, date_from, date_to, limit),
+    }
@@ -1,63 +1,208 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Any, List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Path, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, and_, func, type_coerce
+from sqlalchemy.orm import Session, aliased, load_only
 
 from app.api import deps
 from app.db.session import get_db
 from app.models.book import Book, BookStatus
+from app.models.book_author import BookAuthor
+from app.models.book_category import BookCategory
 from app.models.user import User, UserRole
-from app.schemas.book import BookCreate, BookUpdate, BookResponse
+from app.schemas.book import BookCreate, BookUpdate, BookResponse, BookBatchResponse, BookImportResult, BookSuggestion, book_fields_model
+from app.core.config import settings
 from datetime import datetime
 
 router = APIRouter()
 
-from app.schemas.common import PageResponse
-import math
+from app.schemas.common import FacetedPageResponse, FacetedCursorPageResponse
+from app.core.cache import evict_books
+from app.core.pagination import count_cache, decode_cursor, encode_cursor, filter_key, paginate, raw_key, seek_filter
+from app.services import book_export, book_import, catalog, facets as facet_service, search
+from app.services.book_cache import get_book
+from app.services.suggest import suggest_index
 
-@router.get("/", response_model=PageResponse[BookResponse])
+# Sorting by author/category uses the first (position 0) entry of each book
+_TERM_SORTS = {
+    "author": aliased(BookAuthor, name="primary_author"),
+    "category": aliased(BookCategory, name="primary_category"),
+}
+
+def _resolve_sort(sort: str, score=None):
+    """
+    Parse "field,dir" into (column, descending, normalized sort).
+    "relevance" sorts by the search score when a keyword search is active,
+    "author"/"category" by the book's first author/category.
+    Falls back to created_at,desc for invalid formats or unknown fields.
+    """
+    try:
+        sort_field, sort_dir = sort.split(",")
+        if sort_field == "relevance" and score is not None:
+            descending = sort_dir.lower() == "desc"
+            return score, descending, f"relevance,{'desc' if descending else 'asc'}"
+        if sort_field in _TERM_SORTS:
+            descending = sort_dir.lower() == "desc"
+            return _TERM_SORTS[sort_field].name, descending, f"{sort_field},{'desc' if descending else 'asc'}"
+        if sort_field not in Book.__table__.columns:
+            raise AttributeError(sort_field)
+        descending = sort_dir.lower() == "desc"
+        return getattr(Book, sort_field), descending, f"{sort_field},{'desc' if descending else 'asc'}"
+    except (ValueError, AttributeError):
+        return Book.created_at, True, "created_at,desc"
+
+def _parse_fields(fields: str) -> Tuple[str, ...]:
+    """
+    Validate a `fields` list against BookResponse; book_id is always included.
+    Returned in BookResponse order so equal sets share one cached model.
+    """
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(BookResponse.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("book_id")
+    return tuple(name for name in BookResponse.model_fields if name in requested)
+
+@router.get("/", response_model=Union[FacetedPageResponse[BookResponse], FacetedCursorPageResponse[BookResponse]])
 def read_books(
     db: Session = Depends(get_db),
     page: int = 0,
     size: int = 20,
     keyword: Optional[str] = None,
     category: Optional[str] = None,
-    sort: str = "created_at,desc",
+    author: Optional[str] = None,
+    min_price: Optional[int] = Query(None, ge=0, description="Minimum sale price (effective_price)"),
+    max_price: Optional[int] = Query(None, ge=0, description="Maximum sale price (effective_price)"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    sort: Optional[str] = Query(None, description="field,dir (default: relevance,desc with keyword, else created_at,desc)"),
+    cursor: Optional[str] = Query(None, description="Keyset mode: pass an empty value for the first page, then nextCursor"),
+    exact: bool = Query(True, description="false: cheap bounded count (totalElements may be a lower bound)"),
+    count: bool = Query(True, description="false: skip the total entirely and only report hasNext"),
+    fields: Optional[str] = Query(None, description="Comma-separated BookResponse fields to return, e.g. book_id,title,price,cover_image"),
+    facets: Optional[str] = Query(None, description="Comma-separated facets to count: category, publisher, price"),
 ) -> Any:
     """
     Retrieve books with pagination.
+
+    With `cursor` set, pages are fetched by keyset (sort key, book_id) instead of offset,
+    so every page costs the same regardless of depth.
+    `keyword` is answered by the full-text index and ranked by relevance by default.
+    `exact`/`count` pick how totalElements is computed (see countMode in the response).
+    `category` and `author` match exact names through the indexed book_category/book_author tables.
+    `min_price`/`max_price` (sale price after discount) and `min_rating` are index range filters.
+    `fields` loads and returns only the listed columns.
+    `facets` adds per-value counts over all matching books (not just this page).
     """
     query = db.query(Book).filter(Book.status == BookStatus.AVAILABLE)
+    selected = None
+    if fields:
+        selected = _parse_fields(fields)
+        query = query.options(load_only(*(getattr(Book, name) for name in selected)))
     
+    score = None
     if keyword:
-        query = query.filter(or_(Book.title.ilike(f"%{keyword}%"), Book.authors.ilike(f"%{keyword}%")))
+        query, score = search.apply_search(db, query, keyword)
     if category:
-        query = query.filter(Book.categories.ilike(f"%{category}%"))
+        query = query.join(BookCategory, and_(BookCategory.book_id == Book.book_id, BookCategory.name == category))
+    if author:
+        query = query.join(BookAuthor, and_(BookAuthor.book_id == Book.book_id, BookAuthor.name == author))
+    if min_price is not None:
+        query = query.filter(Book.effective_price >= min_price)
+    if max_price is not None:
+        query = query.filter(Book.effective_price <= max_price)
+    if min_rating is not None:
+        query = query.filter(Book.average_rating >= min_rating)
+    filters = filter_key(
+        keyword=keyword, category=category, author=author,
+        min_price=min_price, max_price=max_price, min_rating=min_rating,
+    )
         
-    # Sorting logic
+    facet_counts = None
+    if facets:
+        requested = {name.strip() for name in facets.split(",") if name.strip()}
+        names = tuple(name for name in facet_service.FACETS if name in requested)
+        unknown = requested - set(names)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(sorted(unknown))}")
+        if names:
+            cache_key = (filters, names)
+            facet_counts = facet_service.compute_facets(db, query, names, cache_key)
+        
+    # Sorting logic (book_id breaks ties so the order is total)
+    if sort is None:
+        sort = "relevance,desc" if score is not None else "created_at,desc"
+    sort_column, descending, normalized_sort = _resolve_sort(sort, score)
+    sort_field = normalized_sort.split(",")[0]
+    if sort_field in _TERM_SORTS:
+        term = _TERM_SORTS[sort_field]
+        query = query.outerjoin(term, and_(term.book_id == Book.book_id, term.position == 0))
+    if descending:
+        query = query.order_by(sort_column.desc(), Book.book_id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Book.book_id.asc())
+
+    if cursor is not None:
+        if cursor:
+            key, last_id = decode_cursor(cursor, normalized_sort)
+            query = query.filter(seek_filter(sort_column, Book.book_id, descending, key, last_id))
+        rows = query.add_columns(raw_key(sort_column)).limit(size + 1).all()
+        has_next = len(rows) > size
+        rows = rows[:size]
+        next_cursor = None
+        if has_next and rows:
+            last_book, last_key = rows[-1]
+            next_cursor = encode_cursor(normalized_sort, last_key, last_book.book_id)
+        result = {
+            "content": [book for book, _ in rows],
+            "size": size,
+            "sort": normalized_sort,
+            "nextCursor": next_cursor,
+            "hasNext": has_next
+        }
+        page_model = FacetedCursorPageResponse
+    else:
+        result = paginate(query, namespace="books", key=filters, page=page, size=size, exact=exact, count=count)
+        result["sort"] = sort
+        page_model = FacetedPageResponse
+    result["facets"] = facet_counts
+
+    if selected is None:
+        return result
+    # Serialize with the reduced model directly; response_model expects full books
+    body = page_model[book_fields_model(selected)].model_validate(result).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+@router.get(":batch", response_model=BookBatchResponse)
+def read_books_batch(
+    db: Session = Depends(get_db),
+    ids: str = Query(..., description="Comma-separated book ids, e.g. 1,2,3", example="1,2,3"),
+) -> Any:
+    """
+    Get many books by ID in one query.
+
+    Books come back in request order (duplicates collapsed). Unknown ids are listed in
+    `missing` and soft-deleted ones in `deleted`, matching the 404 rules of GET /books/{book_id}.
+    """
     try:
-        sort_field, sort_dir = sort.split(",")
-        if sort_dir.lower() == "desc":
-            query = query.order_by(getattr(Book, sort_field).desc())
+        requested = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not requested:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(requested) > settings.BOOK_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BOOK_BATCH_MAX_IDS} ids per request")
+
+    books_map = {b.book_id: b for b in db.query(Book).filter(Book.book_id.in_(requested))}
+    content, missing, deleted = [], [], []
+    for book_id in requested:
+        book = books_map.get(book_id)
+        if book is None:
+            missing.append(book_id)
+        elif book.status == BookStatus.DELETED:
+            deleted.append(book_id)
         else:
-            query = query.order_by(getattr(Book, sort_field).asc())
-    except (ValueError, AttributeError):
-        # Fallback to default if invalid sort format or field
-        query = query.order_by(Book.created_at.desc())
-        
-    total_elements = query.count()
-    total_pages = math.ceil(total_elements / size)
-    
-    books = query.offset(page * size).limit(size).all()
-    
-    return {
-        "content": books,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages,
-        "sort": sort
-    }
+            content.append(book)
+    return {"content": content, "missing": missing, "deleted": deleted}
 
 @router.post("/", response_model=BookResponse)
 def create_book(
@@ -79,10 +224,107 @@ def create_book(
         
     db_obj = Book(**book_in.dict())
     db.add(db_obj)
+    db.flush()
+    catalog.sync_book_terms(db, db_obj)
+    search.index_book(db, db_obj)
     db.commit()
+    count_cache.invalidate("books")
     db.refresh(db_obj)
+    evict_books(db_obj.book_id)
+    suggest_index.add(db_obj)
     return db_obj
 
+@router.post("/import", response_model=BookImportResult)
+def import_books(
+    *,
+    db: Session = Depends(get_db),
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv | ndjson (default: from the file name)"),
+    chunk_size: int = Query(settings.BULK_IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Bulk import books from a CSV (BookCreate columns) or NDJSON upload.
+
+    The upload is read row by row; rows are validated against BookCreate and inserted
+    in chunks (one ISBN IN-query and one executemany per chunk). Invalid or duplicate
+    rows are reported per row instead of failing the import.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    fmt = format
+    if fmt is None:
+        name = (file.filename or "").lower()
+        if name.endswith(".csv") or file.content_type == "text/csv":
+            fmt = "csv"
+        elif name.endswith((".ndjson", ".jsonl")) or file.content_type == "application/x-ndjson":
+            fmt = "ndjson"
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Unsupported import format (use csv or ndjson)")
+
+    result = book_import.import_books(db, file.file, fmt, chunk_size)
+    if result["imported"]:
+        count_cache.invalidate("books")
+        evict_books()
+        suggest_index.invalidate()
+    return result
+
+@router.get("/export", response_class=StreamingResponse, responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}})
+def export_books(
+    *,
+    db: Session = Depends(get_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = Query(None, description="Only books updated at or after this time"),
+    include_deleted: Optional[bool] = Query(None, description="Include soft-deleted books (default: only with since=)"),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Stream the whole catalog (or the books changed since a point in time) as NDJSON or CSV.
+
+    Rows come from a single server-side cursor and are written out as they are
+    fetched, so memory stays flat regardless of catalog size. Incremental exports
+    include soft-deleted books by default so consumers can drop them; pass the
+    X-Export-Watermark header of one export as since= of the next.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if include_deleted is None:
+        include_deleted = since is not None
+    # Taken before the scan starts, so rows updated during the export are picked up next time
+    watermark = db.query(type_coerce(func.now(), DateTime)).scalar()
+    if format == "csv":
+        content = book_export.export_csv(db, since, include_deleted, settings.EXPORT_BATCH_SIZE)
+        media_type = "text/csv"
+    else:
+        content = book_export.export_ndjson(db, since, include_deleted, settings.EXPORT_BATCH_SIZE)
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="books.{format}"',
+            "X-Export-Watermark": watermark.isoformat(),
+        },
+    )
+
+@router.get("/suggest", response_model=List[BookSuggestion])
+def suggest_books(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, description="What the user has typed so far"),
+    k: int = Query(10, ge=1, le=50),
+) -> Any:
+    """
+    Typeahead suggestions for titles and authors, most popular first.
+
+    Served from the in-memory prefix index; the database is only read when the
+    index has to be (re)built.
+    """
+    if suggest_index.is_stale:
+        suggest_index.build(db)
+    return suggest_index.suggest(q, k)
+
 @router.get("/{book_id}", response_model=BookResponse)
 def read_book(
     *,
@@ -92,7 +334,7 @@ def read_book(
     """
     Get book by ID.
     """
-    book = db.query(Book).filter(Book.book_id == book_id).first()
+    book = get_book(db, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     if book.status == BookStatus.DELETED:
@@ -125,8 +367,15 @@ def update_book(
         setattr(book, field, value)
         
     db.add(book)
+    db.flush()
+    if "authors" in update_data or "categories" in update_data:
+        catalog.sync_book_terms(db, book)
+    search.index_book(db, book)
     db.commit()
+    count_cache.invalidate("books")
+    evict_books(book_id)
     db.refresh(book)
+    suggest_index.add(book)
     return book
 
 @router.delete("/{book_id}", responses={200: {"description": "Successful Response", "content": {"application/json": {"example": {"message": "Book deleted successfully"}}}}})
@@ -151,5 +400,9 @@ def delete_book(
     book.deleted_at = datetime.now()
     
     db.add(book)
+    search.remove_book(db, book.book_id)
     db.commit()
+    count_cache.invalidate("books")
+    evict_books(book_id)
+    suggest_index.remove(book_id)
     return {"message": "Book deleted successfully"}
@@ -1,6 +1,6 @@
 from typing import Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -8,8 +8,13 @@ from app.db.session import get_db
 from app.models.cart import Cart, CartStatus
 from app.models.cart_item import CartItem
 from app.models.book import Book
+from app.services.book_cache import get_book
+from app.services.cart import active_cart, add_cart_lines, apply_operations
+from app.services.ordering import orders_committed, place_order
 from app.models.user import User
-from app.schemas.cart import CartResponse, CartItemCreate
+from app.schemas.cart import CartBatchUpdate, CartCheckout, CartResponse, CartItemCreate
+from app.schemas.order import OrderCreate, OrderItemSchema, OrderResponse
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -24,10 +29,7 @@ def read_cart(
     """
     target_user_id = current_user.user_id
 
-    cart = db.query(Cart).filter(
-        Cart.user_id == target_user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
+    cart = active_cart(db, target_user_id)
     
     if not cart:
         cart = Cart(user_id=target_user_id, status=CartStatus.ACTIVE)
@@ -46,48 +48,93 @@ def add_item_to_cart(
 ) -> Any:
     """
     Add item to cart.
+
+    The line is written with one upsert on uq_cart_item_book (quantity and
+    subtotal are incremented in the database, so concurrent adds of the same
+    book can't collide or lose an update); a soft-deleted line is revived at the
+    current price. The book comes from the entity cache.
     """
-    cart = db.query(Cart).filter(
-        Cart.user_id == current_user.user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
-    
-    if not cart:
-        cart = Cart(user_id=current_user.user_id, status=CartStatus.ACTIVE)
-        db.add(cart)
-        db.flush()
-        
-    book = db.query(Book).filter(Book.book_id == item_in.book_id).first()
+    book = get_book(db, item_in.book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
-        
-    # Check if item already exists
-    cart_item = db.query(CartItem).filter(
-        CartItem.cart_id == cart.cart_id,
-        CartItem.book_id == item_in.book_id
-    ).first()
-    
-    if cart_item:
-        cart_item.quantity += item_in.quantity
-        cart_item.subtotal = cart_item.quantity * cart_item.unit_price
-    else:
-        cart_item = CartItem(
-            cart_id=cart.cart_id,
-            book_id=item_in.book_id,
-            quantity=item_in.quantity,
-            unit_price=book.price,
-            subtotal=book.price * item_in.quantity
-        )
-        db.add(cart_item)
-        
-    # Update cart total
+
+    cart = active_cart(db, current_user.user_id, create=True)
+    add_cart_lines(db, cart.cart_id, [(book.book_id, item_in.quantity, book.price)])
+
     # This is simplified; in real app, we'd recalculate total from all items
-    cart.total_amount += (book.price * item_in.quantity)
+    cart.total_amount = Cart.total_amount + book.price * item_in.quantity
     
     db.commit()
     db.refresh(cart)
     return cart
 
+@router.patch("/items", response_model=CartResponse)
+def update_cart_items(
+    *,
+    db: Session = Depends(get_db),
+    batch_in: CartBatchUpdate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Apply a batch of add/set/remove operations to the cart, in order.
+
+    All operations commit together or not at all, with one cart lookup, one IN
+    query for the books and total_amount recomputed once from the live lines.
+    Returns the resulting cart (removed lines are left out).
+    """
+    if len(batch_in.operations) > settings.CART_BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.CART_BATCH_MAX_OPERATIONS} operations per request")
+
+    cart = active_cart(db, current_user.user_id, create=True)
+    items = apply_operations(db, cart, batch_in.operations)
+    # Serialized before commit, which would expire every line
+    response = CartResponse.model_validate({"cart_id": cart.cart_id, "total_amount": cart.total_amount, "items": items})
+    db.commit()
+    return response
+
+@router.post("/checkout", response_model=OrderResponse)
+def checkout_cart(
+    *,
+    db: Session = Depends(get_db),
+    checkout_in: CartCheckout,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Turn the active cart into an order.
+
+    In one transaction: the cart is claimed (ACTIVE -> ORDERED, a conditional
+    UPDATE, so a concurrent checkout of the same cart gets 409), its live lines
+    are read and placed exactly like POST /orders (one batched book fetch, one
+    stock reservation UPDATE) at current prices.
+    """
+    cart = active_cart(db, current_user.user_id)
+    if not cart:
+        raise HTTPException(status_code=404, detail="Cart not found")
+    claimed = (
+        db.query(Cart)
+        .filter(Cart.cart_id == cart.cart_id, Cart.status == CartStatus.ACTIVE)
+        .update({Cart.status: CartStatus.ORDERED}, synchronize_session=False)
+    )
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Cart was already checked out")
+
+    lines = (
+        db.query(CartItem)
+        .filter(CartItem.cart_id == cart.cart_id, CartItem.deleted_at.is_(None))
+        .order_by(CartItem.cart_item_id)
+        .all()
+    )
+    if not lines:
+        raise HTTPException(status_code=400, detail="Cart is empty")
+
+    order_in = OrderCreate(**checkout_in.model_dump(), items=[OrderItemSchema.model_validate(line) for line in lines])
+    db_order = place_order(db, current_user.user_id, order_in)
+    # Serialized before commit, which would expire the order and its items
+    response = OrderResponse.model_validate(db_order)
+    db.commit()
+    orders_committed([db_order])
+    return response
+
 @router.put("/items", responses={200: {"description": "Successful Response", "content": {"application/json": {"example": {"isSuccess": True, "message": "장바구니 항목이 성공적으로 수정되었습니다.", "payload": {"cartId": 1}}}}}})
 def update_cart_item(
     *,
@@ -98,10 +145,7 @@ def update_cart_item(
     """
     Update cart item quantity.
     """
-    cart = db.query(Cart).filter(
-        Cart.user_id == current_user.user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
+    cart = active_cart(db, current_user.user_id)
     
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
@@ -131,30 +175,57 @@ def update_cart_item(
 @router.get("/items")
 def read_cart_items(
     user_id: int = None,
+    expand: bool = Query(False, description="Embed title, cover, current price and stock of each book, and flag price changes"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get cart items.
+    Get cart items (soft-deleted ones are left out).
+
+    One query joining the active cart to its items (and, with expand, to their
+    books), so the client needs no /books/{id} call per line. priceChanged is
+    set when the book's price differs from the unit_price the line was added at.
     """
     target_user_id = current_user.user_id
 
-    cart = db.query(Cart).filter(
-        Cart.user_id == target_user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
-    
-    items = []
-    if cart:
-        items = db.query(CartItem).filter(CartItem.cart_id == cart.cart_id).all()
-        
-    payload = []
-    for item in items:
-        payload.append({
-            "cartItemId": item.cart_item_id,
-            "bookId": item.book_id,
-            "quantity": item.quantity
-        })
+    query = (
+        db.query(CartItem)
+        .join(Cart, Cart.cart_id == CartItem.cart_id)
+        .filter(
+            Cart.user_id == target_user_id,
+            Cart.status == CartStatus.ACTIVE,
+            CartItem.deleted_at.is_(None)
+        )
+        .order_by(CartItem.cart_item_id)
+    )
+    if expand:
+        query = query.join(Book, Book.book_id == CartItem.book_id).add_columns(
+            Book.title, Book.cover_image, Book.price, Book.stock
+        )
+        payload = [
+            {
+                "cartItemId": item.cart_item_id,
+                "bookId": item.book_id,
+                "quantity": item.quantity,
+                "unitPrice": item.unit_price,
+                "subtotal": item.subtotal,
+                "title": title,
+                "coverImage": cover_image,
+                "price": price,
+                "stock": stock,
+                "priceChanged": price != item.unit_price
+            }
+            for item, title, cover_image, price, stock in query
+        ]
+    else:
+        payload = [
+            {
+                "cartItemId": item.cart_item_id,
+                "bookId": item.book_id,
+                "quantity": item.quantity
+            }
+            for item in query
+        ]
         
     return {
         "isSuccess": True,
@@ -171,10 +242,7 @@ def delete_cart_item(
     """
     Delete item from cart (Soft delete).
     """
-    cart = db.query(Cart).filter(
-        Cart.user_id == current_user.user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
+    cart = active_cart(db, current_user.user_id)
     
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
@@ -207,10 +275,7 @@ def clear_cart(
     """
     Clear all items from the current active cart.
     """
-    cart = db.query(Cart).filter(
-        Cart.user_id == current_user.user_id,
-        Cart.status == CartStatus.ACTIVE
-    ).first()
+    cart = active_cart(db, current_user.user_id)
     
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
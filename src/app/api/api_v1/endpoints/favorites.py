@@ -1,12 +1,12 @@
 from typing import Any, List
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.db.session import get_db
 from app.models.favorite import Favorite
-from app.models.book import Book
+from app.services.book_cache import get_book
 from app.models.user import User
 from app.schemas.favorite import FavoriteCreate, FavoriteResponse
 
@@ -22,7 +22,7 @@ def create_favorite(
     """
     Add book to favorites.
     """
-    book = db.query(Book).filter(Book.book_id == favorite_in.book_id).first()
+    book = get_book(db, favorite_in.book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
         
@@ -37,6 +37,7 @@ def create_favorite(
             favorite.deleted_at = None
             db.add(favorite)
             db.commit()
+            count_cache.invalidate("favorites")
             db.refresh(favorite)
         return favorite
         
@@ -47,17 +48,20 @@ def create_favorite(
     )
     db.add(favorite)
     db.commit()
+    count_cache.invalidate("favorites")
     db.refresh(favorite)
     return favorite
 
 from app.schemas.common import PageResponse
-import math
+from app.core.pagination import count_cache, filter_key, paginate
 
 @router.get("/", response_model=PageResponse[FavoriteResponse])
 def read_favorites(
     db: Session = Depends(get_db),
     page: int = 0,
     size: int = 20,
+    exact: bool = Query(True, description="false: cheap bounded count (totalElements may be a lower bound)"),
+    count: bool = Query(True, description="false: skip the total entirely and only report hasNext"),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -67,21 +71,20 @@ def read_favorites(
         Favorite.user_id == current_user.user_id,
         Favorite.is_active == True
     )
-    total_elements = query.count()
-    total_pages = math.ceil(total_elements / size)
-    
-    favorites = query.offset(page * size).limit(size).all()
+    result = paginate(
+        query,
+        namespace="favorites",
+        key=filter_key(user_id=current_user.user_id),
+        page=page,
+        size=size,
+        exact=exact,
+        count=count,
+    )
     # Ensure book data is loaded
-    for fav in favorites:
+    for fav in result["content"]:
         _ = fav.book
     
-    return {
-        "content": favorites,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages
-    }
+    return result
 
 @router.delete("/{book_id}", responses={200: {"description": "Successful Response", "content": {"application/json": {"example": {"message": "Favorite removed successfully"}}}}})
 def delete_favorite(
@@ -105,4 +108,5 @@ def delete_favorite(
     favorite.deleted_at = datetime.now()
     db.add(favorite)
     db.commit()
+    count_cache.invalidate("favorites")
     return {"message": "Favorite removed (soft deleted)"}
@@ -1,14 +1,21 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Path, Response
+from sqlalchemy.orm import Session, selectinload
 
 from app.api import deps
 from app.db.session import get_db
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
-from app.models.book import Book
 from app.models.user import User, UserRole
-from app.schemas.order import OrderCreate, OrderResponse
+from app.schemas.order import OrderCreate, OrderResponse, OrderStatusBulkUpdate, OrderStatusBulkResult
+from app.core.config import settings
+from app.core.cache import evict_books
+from app.services import idempotency, order_status, sales
+from app.services.order_queue import order_queue
+from app.services.ordering import orders_committed, place_order
+from app.services.stock import order_quantities, release_stock
+from app.services.suggest import suggest_index
 
 router = APIRouter()
 
@@ -17,91 +24,129 @@ def create_order(
     *,
     db: Session = Depends(get_db),
     order_in: OrderCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Retries with the same key replay the first response"),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Create new order.
+
+    With an Idempotency-Key header, the response is stored with the order (for
+    IDEMPOTENCY_KEY_TTL_HOURS) and replayed on retries instead of ordering again;
+    reusing a key with a different body is rejected with 422.
+
+    With ORDER_INGEST_QUEUE_ENABLED, orders without a key are placed by the
+    group-commit worker (app/services/order_queue.py) and this call waits for
+    its own result; keyed orders stay on this path so the key and the order
+    commit together.
     """
-    # Calculate total price and validate stock
-    total_price = 0
-    final_price = 0
-    
-    # Create Order
-    db_order = Order(
-        user_id=current_user.user_id,
-        payment_method=order_in.payment_method,
-        receiver_name=order_in.receiver_name,
-        receiver_phone=order_in.receiver_phone,
-        shipping_address=order_in.shipping_address,
-        total_price=0, # Will update
-        final_price=0, # Will update
-        status=OrderStatus.CREATED
-    )
-    db.add(db_order)
-    db.flush() # Get ID
-    
-    # Optimized: Fetch all books in one query
-    book_ids = [item.book_id for item in order_in.items]
-    books = db.query(Book).filter(Book.book_id.in_(book_ids)).all()
-    books_map = {b.book_id: b for b in books}
-
-    for item in order_in.items:
-        book = books_map.get(item.book_id)
-        if not book:
-            raise HTTPException(status_code=404, detail=f"Book {item.book_id} not found")
-        if book.stock < item.quantity:
-            raise HTTPException(status_code=400, detail=f"Not enough stock for book {book.title}")
-            
-        # Update stock
-        book.stock -= item.quantity
-        
-        # Create OrderItem
-        db_item = OrderItem(
-            order_id=db_order.order_id,
-            book_id=item.book_id,
-            quantity=item.quantity,
-            unit_price=book.price,
-            subtotal=book.price * item.quantity
-        )
-        db.add(db_item)
-        total_price += db_item.subtotal
-        
-    db_order.total_price = total_price
-    db_order.final_price = total_price # Apply discount logic here if needed
+    record = None
+    if settings.ORDER_INGEST_QUEUE_ENABLED and not idempotency_key:
+        return order_queue.submit(db, current_user.user_id, order_in)
+
+    if idempotency_key:
+        payload_hash = idempotency.request_hash(order_in.model_dump(mode="json"))
+        record = idempotency.begin(db, current_user.user_id, idempotency_key, payload_hash)
+        if isinstance(record, Response):
+            return record
+
+    db_order = place_order(db, current_user.user_id, order_in)
+    if record is not None:
+        idempotency.complete(record, 200, OrderResponse.model_validate(db_order).model_dump_json())
     
     db.commit()
+    orders_committed([db_order])
     db.refresh(db_order)
     return db_order
 
-from app.schemas.common import PageResponse
-import math
+from app.schemas.common import CursorPageResponse, PageResponse
+from app.core.pagination import count_cache, decode_cursor, encode_cursor, filter_key, paginate, raw_key, seek_filter
 
-@router.get("/", response_model=PageResponse[OrderResponse])
+# Orders are always listed newest first
+ORDER_SORT = "created_at,desc"
+
+@router.get("/", response_model=Union[PageResponse[OrderResponse], CursorPageResponse[OrderResponse]])
 def read_orders(
     db: Session = Depends(get_db),
     page: int = 0,
     size: int = 20,
+    status: Optional[OrderStatus] = None,
+    created_from: Optional[datetime] = Query(None, description="Orders created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Orders created before this time"),
+    cursor: Optional[str] = Query(None, description="Keyset mode: pass an empty value for the first page, then nextCursor"),
+    exact: bool = Query(True, description="false: cheap bounded count (totalElements may be a lower bound)"),
+    count: bool = Query(True, description="false: skip the total entirely and only report hasNext"),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve own orders with pagination. Admin can view all orders.
+    Retrieve own orders with pagination, newest first. Admin can view all orders.
+
+    Items are loaded with one extra IN query per page (selectinload), so LIMIT
+    counts orders rather than joined item rows. With `cursor` set, pages are
+    fetched by keyset (created_at, order_id), served by the (user_id, created_at) index.
     """
     if current_user.role == UserRole.ADMIN:
         query = db.query(Order)
+        user_id = None
     else:
         query = db.query(Order).filter(Order.user_id == current_user.user_id)
-    total_elements = query.count()
-    total_pages = math.ceil(total_elements / size)
+        user_id = current_user.user_id
+    if status is not None:
+        query = query.filter(Order.status == status)
+    if created_from is not None:
+        query = query.filter(Order.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(Order.created_at < created_to)
     
-    orders = query.options(joinedload(Order.items)).offset(page * size).limit(size).all()
-    
-    return {
-        "content": orders,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages
-    }
+    query = query.options(selectinload(Order.items)).order_by(Order.created_at.desc(), Order.order_id.desc())
+
+    if cursor is not None:
+        if cursor:
+            key, last_id = decode_cursor(cursor, ORDER_SORT)
+            query = query.filter(seek_filter(Order.created_at, Order.order_id, True, key, last_id))
+        rows = query.add_columns(raw_key(Order.created_at)).limit(size + 1).all()
+        has_next = len(rows) > size
+        rows = rows[:size]
+        next_cursor = None
+        if has_next and rows:
+            last_order, last_key = rows[-1]
+            next_cursor = encode_cursor(ORDER_SORT, last_key, last_order.order_id)
+        return {
+            "content": [order for order, _ in rows],
+            "size": size,
+            "sort": ORDER_SORT,
+            "nextCursor": next_cursor,
+            "hasNext": has_next
+        }
+
+    key = filter_key(user_id=user_id, status=status, created_from=created_from, created_to=created_to)
+    return paginate(query, namespace="orders", key=key, page=page, size=size, exact=exact, count=count)
+
+@router.post("/bulk-status", response_model=OrderStatusBulkResult)
+def bulk_update_order_status(
+    *,
+    db: Session = Depends(get_db),
+    update_in: OrderStatusBulkUpdate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Move many orders to PAID, SHIPPED or COMPLETED at once (Admin only).
+
+    Allowed transitions are CREATED -> PAID -> SHIPPED -> COMPLETED; each applies
+    as one UPDATE per source status, stamping paid_at/shipped_at/completed_at,
+    in a single commit. Results are reported per order id.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if update_in.status not in order_status.TRANSITIONS:
+        raise HTTPException(status_code=400, detail=f"Bulk transition to {update_in.status.value} is not supported")
+    if len(update_in.order_ids) > settings.ORDER_BULK_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.ORDER_BULK_MAX_IDS} order ids per request")
+
+    result = order_status.bulk_transition(db, update_in.order_ids, update_in.status)
+    db.commit()
+    if result["updated"]:
+        count_cache.invalidate("orders")
+    return result
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def read_order_by_id(
@@ -113,7 +158,7 @@ def read_order_by_id(
     """
     Get order by ID.
     """
-    order = db.query(Order).filter(Order.order_id == order_id).first()
+    order = db.query(Order).options(selectinload(Order.items)).filter(Order.order_id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
         
@@ -130,7 +175,7 @@ def cancel_order(
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Cancel an order.
+    Cancel an order and return its items to stock.
     """
     order = db.query(Order).filter(Order.order_id == order_id).first()
     if not order:
@@ -139,11 +184,26 @@ def cancel_order(
     if order.user_id != current_user.user_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
         
-    if order.status not in [OrderStatus.CREATED, OrderStatus.PAID]:
+    cancelable = [OrderStatus.CREATED, OrderStatus.PAID]
+    if order.status not in cancelable:
          raise HTTPException(status_code=409, detail="Cannot cancel order in current status")
 
-    order.status = OrderStatus.CANCELED
-    db.add(order)
+    # Conditional on the status, so two concurrent cancels can't both restore stock
+    canceled = (
+        db.query(Order)
+        .filter(Order.order_id == order_id, Order.status.in_(cancelable))
+        .update({Order.status: OrderStatus.CANCELED, Order.canceled_at: datetime.now()}, synchronize_session=False)
+    )
+    if not canceled:
+        raise HTTPException(status_code=409, detail="Cannot cancel order in current status")
+    lines = db.query(OrderItem.book_id, OrderItem.quantity, OrderItem.subtotal).filter(OrderItem.order_id == order_id).all()
+    quantities = order_quantities((book_id, quantity) for book_id, quantity, _ in lines)
+    release_stock(db, quantities)
+    sales.record_order(db, order.created_at.date(), lines, sign=-1)
     db.commit()
+    count_cache.invalidate("orders") # status-filtered totals changed
+    evict_books(*quantities) # stock changed
+    for book_id, quantity in quantities.items():
+        suggest_index.bump(book_id, -quantity)
     db.refresh(order)
     return order
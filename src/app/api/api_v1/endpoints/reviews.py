@@ -1,11 +1,11 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.db.session import get_db
 from app.models.review import Review
-from app.models.book import Book
+from app.services.book_cache import get_book
 from app.models.user import User, UserRole
 from app.schemas.review import ReviewCreate, ReviewResponse, ReviewUpdate
 
@@ -22,7 +22,7 @@ def create_review(
     """
     Create new review.
     """
-    book = db.query(Book).filter(Book.book_id == book_id).first()
+    book = get_book(db, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
         
@@ -42,11 +42,12 @@ def create_review(
     )
     db.add(review)
     db.commit()
+    count_cache.invalidate("reviews")
     db.refresh(review)
     return review
 
 from app.schemas.common import PageResponse
-import math
+from app.core.pagination import count_cache, filter_key, paginate
 
 @router.get("/{book_id}", response_model=PageResponse[ReviewResponse])
 def read_reviews(
@@ -54,23 +55,15 @@ def read_reviews(
     db: Session = Depends(get_db),
     page: int = 0,
     size: int = 20,
+    exact: bool = Query(True, description="false: cheap bounded count (totalElements may be a lower bound)"),
+    count: bool = Query(True, description="false: skip the total entirely and only report hasNext"),
 ) -> Any:
     """
     Get reviews for a book with pagination.
     """
     query = db.query(Review).filter(Review.book_id == book_id)
-    total_elements = query.count()
-    total_pages = math.ceil(total_elements / size)
-    
-    reviews = query.offset(page * size).limit(size).all()
-    
-    return {
-        "content": reviews,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages
-    }
+    key = filter_key(book_id=book_id)
+    return paginate(query, namespace="reviews", key=key, page=page, size=size, exact=exact, count=count)
 
 @router.patch("/{review_id}")
 def update_review(
@@ -134,6 +127,7 @@ def delete_review(
     try:
         db.delete(review)
         db.commit()
+        count_cache.invalidate("reviews")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,6 @@
 from typing import Any, List
 from datetime import datetime
-from fastapi import APIRouter, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
@@ -13,31 +13,22 @@ from app.schemas.user import UserCreate, UserUpdate, UserResponse
 router = APIRouter()
 
 from app.schemas.common import PageResponse
-import math
+from app.core.pagination import count_cache, filter_key, paginate
 
 @router.get("/", response_model=PageResponse[UserResponse])
 def read_users(
     db: Session = Depends(get_db),
     page: int = 0,
     size: int = 20,
+    exact: bool = Query(True, description="false: cheap bounded count (totalElements may be a lower bound)"),
+    count: bool = Query(True, description="false: skip the total entirely and only report hasNext"),
     current_user: User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users with pagination.
     """
     query = db.query(User)
-    total_elements = query.count()
-    total_pages = math.ceil(total_elements / size)
-    
-    users = query.offset(page * size).limit(size).all()
-    
-    return {
-        "content": users,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages
-    }
+    return paginate(query, namespace="users", key=filter_key(), page=page, size=size, exact=exact, count=count)
 
 @router.post("/", response_model=UserResponse)
 def create_user(
@@ -68,6 +59,7 @@ def create_user(
     db_obj = User(**obj_in_data, password=security.get_password_hash(user_in.password))
     db.add(db_obj)
     db.commit()
+    count_cache.invalidate("users")
     db.refresh(db_obj)
     db.refresh(db_obj)
     return db_obj
@@ -196,4 +188,5 @@ def delete_user_by_admin(
         
     db.delete(user)
     db.commit()
+    count_cache.invalidate("users")
     return {"message": "User permanently deleted by admin"}
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with per-entry TTL and optional tags.
+
+    Tags group entries so a write can evict everything it affects at once
+    (e.g. every cached listing of books). Hit/miss/eviction counters are kept
+    for the metrics endpoint.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped by every eviction, so a response computed across a write isn't stored
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), generation: Optional[int] = None) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            tags = tuple(tags)
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            if key in self._entries:
+                self._remove(key)
+                self.evictions += 1
+
+    def evict_tag(self, tag: str) -> int:
+        """
+        Drop every entry carrying the tag; returns how many were dropped.
+        """
+        with self._lock:
+            self.generation += 1
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+            self.evictions += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# Serialized GET responses for the catalog (see ResponseCacheMiddleware)
+response_cache = LRUCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+# Facet counts per book search (see app/services/facets.py)
+facet_cache = LRUCache(1024, settings.COUNT_CACHE_TTL_SECONDS)
+
+# Book rows by primary key (see app/services/book_cache.py)
+book_cache = LRUCache(settings.BOOK_CACHE_MAX_ENTRIES, settings.BOOK_CACHE_TTL_SECONDS)
+
+
+def evict_books(*book_ids: int) -> None:
+    """
+    Evict cached data affected by a write to the given books: their entities and
+    detail pages, every listing (any of which may contain them) and facet counts.
+    """
+    response_cache.evict_tag("books:list")
+    facet_cache.evict_tag("books")
+    for book_id in book_ids:
+        book_cache.delete(book_id)
+        response_cache.evict_tag(f"book:{book_id}")
@@ -21,6 +21,46 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
     
+    # Paginated list totals are cached per filter set for this long (0 disables)
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    
+    # GET /books response cache (ETag / If-None-Match)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    
+    # Rows per executemany batch for POST /books/import
+    BULK_IMPORT_CHUNK_SIZE: int = 1000
+    
+    # Max ids per GET /books:batch request
+    BOOK_BATCH_MAX_IDS: int = 100
+    
+    # Rows fetched per server-side cursor batch (and per streamed chunk) in GET /books/export
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Process-local Book entity cache (see app/services/book_cache.py); 0 disables
+    BOOK_CACHE_MAX_ENTRIES: int = 10000
+    BOOK_CACHE_TTL_SECONDS: int = 300
+    
+    # How long an Idempotency-Key on POST /orders is remembered
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    
+    # Max order ids per POST /orders/bulk-status request
+    ORDER_BULK_MAX_IDS: int = 1000
+    
+    # Max operations per PATCH /carts/items request
+    CART_BATCH_MAX_OPERATIONS: int = 100
+    
+    # Group-commit order ingestion (see app/services/order_queue.py): POST /orders
+    # without an Idempotency-Key is queued and committed in batches of up to
+    # MAX_BATCH orders, waiting at most MAX_WAIT_MS for a batch to fill
+    ORDER_INGEST_QUEUE_ENABLED: bool = False
+    ORDER_INGEST_MAX_BATCH: int = 50
+    ORDER_INGEST_MAX_WAIT_MS: int = 5
+    ORDER_INGEST_TIMEOUT_SECONDS: int = 30
+    
+    # In-memory typeahead index is rebuilt from the DB when older than this
+    SUGGEST_INDEX_MAX_AGE_SECONDS: int = 600
+    
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 settings = Settings()
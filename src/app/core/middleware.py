@@ -1,7 +1,9 @@
 import time
 import logging
 import json
-from typing import Callable
+import hashlib
+import re
+from typing import Callable, List, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
@@ -70,3 +72,62 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.requests[client_ip].append(now)
         
         return await call_next(request)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Caches successful GET responses as serialized bytes with a strong ETag.
+
+    rules maps path regexes to a cache tag (formatted with the regex groups), which
+    endpoints evict on writes. Entries are keyed on path plus sorted query params;
+    a matching If-None-Match gets a bodyless 304.
+    """
+    def __init__(self, app: ASGIApp, cache, rules: List[Tuple[str, str]]):
+        super().__init__(app)
+        self.cache = cache
+        self.rules = [(re.compile(pattern), tag) for pattern, tag in rules]
+
+    def _tag(self, path: str):
+        for pattern, tag in self.rules:
+            match = pattern.match(path)
+            if match:
+                return tag.format(**match.groupdict())
+        return None
+
+    @staticmethod
+    def _etag_matches(request: Request, etag: str) -> bool:
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+        candidates = [value.strip() for value in header.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    def _respond(self, request: Request, body: bytes, etag: str, media_type: str) -> Response:
+        headers = {"ETag": etag}
+        if self._etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, status_code=200, headers=headers, media_type=media_type)
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if request.method != "GET":
+            return await call_next(request)
+        path = request.url.path
+        tag = self._tag(path)
+        if tag is None:
+            return await call_next(request)
+
+        key = (path, tuple(sorted(request.query_params.multi_items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            body, etag, media_type = cached
+            return self._respond(request, body, etag, media_type)
+
+        generation = self.cache.generation
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        media_type = response.media_type or response.headers.get("content-type", "application/json")
+        self.cache.set(key, (body, etag, media_type), tags=(tag,), generation=generation)
+        return self._respond(request, body, etag, media_type)
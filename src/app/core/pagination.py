@@ -0,0 +1,203 @@
+import base64
+import binascii
+import json
+import math
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, type_coerce
+from sqlalchemy.orm import Query
+from sqlalchemy.types import NullType
+
+from app.core.config import settings
+
+
+def raw_key(column: Any) -> Any:
+    """
+    Column expression without type processing.
+
+    Cursor keys are compared exactly as the database stores them, so the seek
+    predicate matches the ORDER BY even when stored formats differ from what the
+    ORM would bind (e.g. SQLite CURRENT_TIMESTAMP vs. microsecond datetimes).
+    """
+    return type_coerce(column, NullType())
+
+
+def _dump_key(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    return value
+
+
+def _load_key(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$dec" in value:
+            return Decimal(value["$dec"])
+        raise ValueError("Unknown cursor key type")
+    return value
+
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    """
+    Build an opaque cursor from the last row of a page.
+    """
+    payload = {"s": sort, "k": _dump_key(key), "id": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor into (sort key, row id). The cursor must belong to the same sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = _load_key(payload["k"])
+        row_id = int(payload["id"])
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    return key, row_id
+
+
+def seek_filter(column: Any, id_column: Any, descending: bool, key: Any, row_id: int) -> Any:
+    """
+    Keyset predicate for rows after (key, row_id) in ORDER BY column, id_column.
+
+    NULLs sort lowest (SQLite/MySQL), i.e. first ascending and last descending.
+    """
+    col = raw_key(column)
+    if descending:
+        if key is None:
+            return and_(column.is_(None), id_column < row_id)
+        return or_(
+            col < key,
+            and_(col == key, id_column < row_id),
+            column.is_(None),
+        )
+    if key is None:
+        return or_(
+            and_(column.is_(None), id_column > row_id),
+            column.isnot(None),
+        )
+    return or_(col > key, and_(col == key, id_column > row_id))
+
+
+class CountCache:
+    """
+    Process-local cache of list totals, keyed by (namespace, normalized filters).
+
+    Entries expire after ttl_seconds; writes invalidate a whole namespace
+    (e.g. "books") since any insert/update/delete may move rows between filter sets.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, Hashable], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[(namespace, key)]
+                return None
+            return value
+
+    def set(self, namespace: str, key: Hashable, value: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[(namespace, key)] = (value, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL_SECONDS)
+
+# How many pages past the current one exact=false probes before giving up on a total
+ESTIMATE_PAGES = 10
+
+
+def filter_key(**filters: Any) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Normalize a filter set into a hashable cache key (unset filters are dropped).
+    """
+    return tuple(sorted((name, value) for name, value in filters.items() if value is not None))
+
+
+def paginate(
+    query: Query,
+    *,
+    namespace: str,
+    key: Hashable,
+    page: int,
+    size: int,
+    exact: bool = True,
+    count: bool = True,
+) -> Dict[str, Any]:
+    """
+    Fetch one offset page plus its total using the requested count strategy.
+
+    - exact (default): cached total for this filter set, else COUNT(*) ("cached"/"exact")
+    - exact=False: cached total, else count at most ESTIMATE_PAGES pages ahead;
+      past that, totalElements is a lower bound ("estimate")
+    - count=False: no COUNT at all, only hasNext ("none")
+    """
+    total: Optional[int] = None
+    mode = "none"
+    if count:
+        total = count_cache.get(namespace, key)
+        mode = "cached"
+        if total is None and exact:
+            total = query.order_by(None).count()
+            mode = "exact"
+            count_cache.set(namespace, key, total)
+        elif total is None:
+            cap = (page + ESTIMATE_PAGES) * size + 1
+            total = query.order_by(None).limit(cap).count()
+            mode = "exact"
+            if total < cap:
+                count_cache.set(namespace, key, total)
+            else:
+                total = cap - 1
+                mode = "estimate"
+
+    if total is None:
+        rows = query.offset(page * size).limit(size + 1).all()
+        has_next = len(rows) > size
+        rows = rows[:size]
+    else:
+        rows = query.offset(page * size).limit(size).all()
+        has_next = mode == "estimate" or (page + 1) * size < total
+
+    return {
+        "content": rows,
+        "page": page,
+        "size": size,
+        "totalElements": total,
+        "totalPages": math.ceil(total / size) if total is not None and size else None,
+        "countMode": mode,
+        "hasNext": has_next,
+    }
@@ -3,8 +3,14 @@
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.book import Book  # noqa
+from app.models.book_category import BookCategory  # noqa
+from app.models.book_author import BookAuthor  # noqa
 from app.models.order import Order  # noqa
 from app.models.order_item import OrderItem  # noqa
+from app.models.idempotency_key import IdempotencyKey  # noqa
+from app.models.sales_daily import SalesDaily  # noqa
+from app.models.sales_book_daily import SalesBookDaily  # noqa
+from app.models.sales_category_daily import SalesCategoryDaily  # noqa
 from app.models.cart import Cart  # noqa
 from app.models.cart_item import CartItem  # noqa
 from app.models.review import Review  # noqa
@@ -0,0 +1,135 @@
+"""
+EXPLAIN-based check that the hot endpoint queries are served by indexes.
+
+Each entry in HOT_QUERIES builds the same query an endpoint runs (with ids taken
+from the database), and explain() flags full table scans and sorts that can't use
+an index. See scripts/index_advisor.py.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Query, Session
+
+from app.models.book import Book, BookStatus
+from app.models.book_category import BookCategory
+from app.models.cart import Cart, CartStatus
+from app.models.cart_item import CartItem
+from app.models.favorite import Favorite
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.review import Review
+
+
+def _sample_id(db: Session, column: Any) -> int:
+    return db.query(func.min(column)).scalar() or 1
+
+
+def _book_list(db: Session) -> Query:
+    return (
+        db.query(Book)
+        .filter(Book.status == BookStatus.AVAILABLE)
+        .order_by(Book.created_at.desc(), Book.book_id.desc())
+        .limit(20)
+    )
+
+
+def _book_price_range(db: Session) -> Query:
+    return (
+        db.query(Book)
+        .filter(Book.status == BookStatus.AVAILABLE, Book.effective_price.between(10000, 20000))
+        .order_by(Book.effective_price.asc(), Book.book_id.asc())
+        .limit(20)
+    )
+
+
+def _book_min_rating(db: Session) -> Query:
+    return db.query(Book).filter(Book.status == BookStatus.AVAILABLE, Book.average_rating >= 4.5).limit(20)
+
+
+def _book_by_category(db: Session) -> Query:
+    name = db.query(BookCategory.name).limit(1).scalar() or "Fiction"
+    return (
+        db.query(Book)
+        .join(BookCategory, and_(BookCategory.book_id == Book.book_id, BookCategory.name == name))
+        .filter(Book.status == BookStatus.AVAILABLE)
+        .limit(20)
+    )
+
+
+def _orders_by_user(db: Session) -> Query:
+    user_id = _sample_id(db, Order.user_id)
+    return db.query(Order).filter(Order.user_id == user_id).order_by(Order.created_at.desc()).limit(20)
+
+
+def _order_items(db: Session) -> Query:
+    return db.query(OrderItem).filter(OrderItem.order_id == _sample_id(db, OrderItem.order_id))
+
+
+def _reviews_by_book(db: Session) -> Query:
+    return db.query(Review).filter(Review.book_id == _sample_id(db, Review.book_id)).limit(20)
+
+
+def _favorites_by_user(db: Session) -> Query:
+    user_id = _sample_id(db, Favorite.user_id)
+    return db.query(Favorite).filter(Favorite.user_id == user_id, Favorite.is_active == True).limit(20)
+
+
+def _active_cart(db: Session) -> Query:
+    user_id = _sample_id(db, Cart.user_id)
+    return db.query(Cart).filter(Cart.user_id == user_id, Cart.status == CartStatus.ACTIVE)
+
+
+def _cart_items(db: Session) -> Query:
+    return db.query(CartItem).filter(CartItem.cart_id == _sample_id(db, CartItem.cart_id))
+
+
+HOT_QUERIES: Dict[str, Callable[[Session], Query]] = {
+    "GET /books": _book_list,
+    "GET /books?min_price&max_price&sort=effective_price": _book_price_range,
+    "GET /books?min_rating": _book_min_rating,
+    "GET /books?category": _book_by_category,
+    "GET /orders": _orders_by_user,
+    "GET /orders (items)": _order_items,
+    "GET /reviews/{book_id}": _reviews_by_book,
+    "GET /favorites": _favorites_by_user,
+    "GET /carts": _active_cart,
+    "GET /carts (items)": _cart_items,
+}
+
+
+def explain(db: Session, query: Query) -> Tuple[List[str], List[str]]:
+    """
+    Return (plan lines, problems) for a query on SQLite or MySQL.
+    """
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    plan: List[str] = []
+    problems: List[str] = []
+    if dialect.name == "sqlite":
+        for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+            detail = row[-1]
+            plan.append(detail)
+            if detail.startswith("SCAN ") and " USING " not in detail:
+                problems.append(f"full scan: {detail}")
+            elif "TEMP B-TREE" in detail:
+                problems.append(f"sort without index: {detail}")
+    elif dialect.name == "mysql":
+        result = db.connection().exec_driver_sql(f"EXPLAIN {sql}")
+        for row in result.mappings():
+            plan.append(
+                f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}"
+            )
+            if row["type"] == "ALL":
+                problems.append(f"full scan of {row['table']} ({row['rows']} rows)")
+            if row["Extra"] and "Using filesort" in row["Extra"]:
+                problems.append(f"filesort on {row['table']}")
+    else:
+        raise ValueError(f"EXPLAIN parsing not supported for {dialect.name}")
+    return plan, problems
+
+
+def advise(db: Session) -> Dict[str, Tuple[List[str], List[str]]]:
+    """
+    Explain every hot query; maps query name to (plan lines, problems).
+    """
+    return {name: explain(db, build(db)) for name, build in HOT_QUERIES.items()}
@@ -1,10 +1,18 @@
-from app.db.session import engine
+from app.db.session import engine, SessionLocal
 from app.db.base import Base
+from app.services import search
 
 def init_db():
     print("Creating tables...")
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully.")
+    search.ensure_index(engine)
+    db = SessionLocal()
+    try:
+        search.rebuild_index(db)
+    finally:
+        db.close()
+    print("Search index ready.")
 
 if __name__ == "__main__":
     init_db()
@@ -218,6 +218,7 @@ def init_db(db: Session) -> None:
 
 from app.db.session import SessionLocal, engine
 from app.db.base import Base
+from app.services import catalog, search
 
 def main() -> None:
     # Create tables if they don't exist
@@ -324,6 +325,8 @@ def main() -> None:
             db.add(review)
             
         db.commit()
+        catalog.rebuild_book_terms(db)
+        search.rebuild_index(db)
         print("Bulk data generation complete!")
     finally:
         db.close()
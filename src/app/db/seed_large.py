@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal, engine
 from app.db.base import Base
+from app.services import catalog, search
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole, UserStatus, Gender
 from app.models.book import Book, BookStatus
@@ -141,6 +142,8 @@ def main() -> None:
                 print(f"Created {i} orders...")
                 
         db.commit()
+        catalog.rebuild_book_terms(db)
+        search.rebuild_index(db)
         print("Large scale data generation complete!")
     finally:
         db.close()
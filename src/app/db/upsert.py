@@ -0,0 +1,49 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    keys: Sequence[str],
+    increment: Sequence[str] = (),
+    replace: Sequence[str] = (),
+    expressions: Optional[Dict[str, Callable[[Any], Any]]] = None,
+) -> None:
+    """
+    Insert rows, or update the existing row with the same key in one statement:
+    `increment` columns are added to, `replace` columns overwritten, and
+    `expressions` columns set to expression(new), where new.<column> is the
+    value the row would have been inserted with.
+
+    MySQL applies the assignments left to right and lets later ones see earlier
+    results, SQLite doesn't: an expression must not read a column assigned
+    before it (they are applied in the order given, after increment/replace).
+
+    Uses INSERT ... ON DUPLICATE KEY UPDATE on MySQL and INSERT ... ON CONFLICT
+    DO UPDATE on SQLite (keys must be the primary key or a unique constraint).
+    All rows go in one executemany; the caller commits.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        new = stmt.inserted
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(table)
+        new = stmt.excluded
+    else:
+        raise NotImplementedError(f"upsert is not supported on {dialect}")
+    values = {name: table.c[name] + new[name] for name in increment}
+    values.update({name: new[name] for name in replace})
+    values.update({name: expression(new) for name, expression in (expressions or {}).items()})
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update(list(values.items()))
+    else:
+        stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_=values)
+    db.execute(stmt, rows)
@@ -13,7 +13,11 @@ from app.core.exceptions import (
     sqlalchemy_exception_handler,
 )
 
-from app.core.middleware import StructuredLoggingMiddleware, RateLimitMiddleware
+from app.core.middleware import StructuredLoggingMiddleware, RateLimitMiddleware, ResponseCacheMiddleware
+from app.core.cache import book_cache, response_cache
+from app.db.session import SessionLocal
+from app.services import suggest
+from app.services.order_queue import order_queue
 
 from app.schemas.common import ErrorResponse
 
@@ -247,6 +251,16 @@ app = FastAPI(
 # Add Middleware
 from fastapi.middleware.cors import CORSMiddleware
 
+# Innermost, so CORS/logging/rate limiting still apply to cached responses
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    rules=[
+        (rf"^{settings.API_V1_STR}/books/?$", "books:list"),
+        (rf"^{settings.API_V1_STR}/books:batch$", "books:list"),
+        (rf"^{settings.API_V1_STR}/books/(?P<book_id>\d+)$", "book:{book_id}"),
+    ],
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], # In production, replace with specific origins
@@ -264,10 +278,26 @@ app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def warm_up_suggest_index():
+    db = SessionLocal()
+    try:
+        suggest.warm_up(db)
+    finally:
+        db.close()
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "version": "0.1.0"}
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "responseCache": response_cache.stats(),
+        "bookCache": book_cache.stats(),
+        "orderQueue": order_queue.stats(),
+    }
+
 @app.get("/")
 def root():
     return {"message": "Welcome to the Practical API Server"}
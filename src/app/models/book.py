@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Integer, String, Text, ForeignKey, DateTime, Enum, BigInteger, Numeric
+from sqlalchemy import DDL, event, Index, Integer, Column, Integer, String, Text, ForeignKey, DateTime, Enum, BigInteger, Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -10,6 +10,17 @@ class BookStatus(str, enum.Enum):
     DISCONTINUED = "DISCONTINUED"
     DELETED = "DELETED"
 
+def effective_price(price: int, discount_rate: int) -> int:
+    """
+    Sale price after discount, rounded down (same as the SQL backfill).
+    """
+    return price * (100 - (discount_rate or 0)) // 100
+
+def _default_effective_price(context):
+    # Also covers Core/executemany inserts (e.g. the bulk importer)
+    params = context.get_current_parameters()
+    return effective_price(params["price"], params.get("discount_rate"))
+
 class Book(Base):
     book_id = Column(Integer, primary_key=True, autoincrement=True)
     # seller_id = Column(Integer, ForeignKey("seller.seller_id"), nullable=False) # Removed
@@ -23,6 +34,7 @@ class Book(Base):
     
     price = Column(Integer, nullable=False)
     discount_rate = Column(Integer, default=0)
+    effective_price = Column(Integer, default=_default_effective_price, nullable=False) # price after discount_rate
     stock = Column(Integer, default=0)
     average_rating = Column(Numeric(2, 1), default=0.0)
     review_count = Column(Integer, default=0)
@@ -39,3 +51,27 @@ class Book(Base):
     
     
     seller = None # Removed relationship
+
+    __table_args__ = (
+        Index('ix_book_updated_at', 'updated_at'), # incremental exports (since=)
+        # Listings filter on status first, then range-scan/sort the second column
+        Index('ix_book_status_created_at', 'status', 'created_at'),
+        Index('ix_book_status_effective_price', 'status', 'effective_price'),
+        Index('ix_book_status_average_rating', 'status', 'average_rating'),
+    )
+
+@event.listens_for(Book, "before_update")
+def _update_effective_price(mapper, connection, target):
+    target.effective_price = effective_price(target.price, target.discount_rate)
+
+# Keyword search index over title/authors/publisher/summary (see app/services/search.py).
+# SQLite keeps a separate FTS5 table keyed by rowid = book_id; MySQL uses a FULLTEXT index.
+BOOK_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS book_fts USING fts5("
+    "title, authors, publisher, summary, tokenize='unicode61 remove_diacritics 2')"
+)
+BOOK_FULLTEXT_DDL = "CREATE FULLTEXT INDEX ft_book_search ON book (title, authors, publisher, summary)"
+
+event.listen(Book.__table__, "after_create", DDL(BOOK_FTS_DDL).execute_if(dialect="sqlite"))
+event.listen(Book.__table__, "before_drop", DDL("DROP TABLE IF EXISTS book_fts").execute_if(dialect="sqlite"))
+event.listen(Book.__table__, "after_create", DDL(BOOK_FULLTEXT_DDL).execute_if(dialect="mysql"))
@@ -0,0 +1,14 @@
+from sqlalchemy import Integer, Column, String, ForeignKey, Index
+from app.db.base_class import Base
+
+class BookCategory(Base):
+    """
+    One row per (book, category), normalized from Book.categories (JSON array).
+    """
+    book_id = Column(Integer, ForeignKey("book.book_id"), primary_key=True)
+    name = Column(String(100), primary_key=True)
+    position = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index('ix_book_category_name_book', 'name', 'book_id'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Integer, String, ForeignKey, DateTime, Enum, BigInteger
+from sqlalchemy import Index, Integer, Column, Integer, String, ForeignKey, DateTime, Enum, BigInteger
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -21,3 +21,7 @@ class Cart(Base):
     deleted_at = Column(DateTime, nullable=True)
     
     user = relationship("User", backref="carts")
+
+    __table_args__ = (
+        Index('ix_cart_user_status', 'user_id', 'status'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, ForeignKey, Boolean, DateTime, BigInteger, UniqueConstraint
+from sqlalchemy import Integer, Column, ForeignKey, Boolean, DateTime, BigInteger, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -18,4 +18,5 @@ class Favorite(Base):
     
     __table_args__ = (
         UniqueConstraint('user_id', 'book_id', name='uq_favorite_user_book'),
+        Index('ix_favorite_user_active', 'user_id', 'is_active'),
     )
@@ -0,0 +1,19 @@
+from sqlalchemy import Integer, Column, String, Text, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class IdempotencyKey(Base):
+    """
+    Outcome of a request made with an Idempotency-Key header, replayed on retries.
+    Keys are scoped per user; the primary key makes the lookup a single index seek.
+    """
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+
+    request_hash = Column(String(64), nullable=False) # sha256 of the canonical request body
+    # Set in the same transaction as the work itself, so committed rows always have them
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Integer, String, ForeignKey, DateTime, Enum, BigInteger
+from sqlalchemy import Index, Integer, Column, Integer, String, ForeignKey, DateTime, Enum, BigInteger
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -40,3 +40,7 @@ class Order(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     user = relationship("User", backref="orders")
+
+    __table_args__ = (
+        Index('ix_order_user_created_at', 'user_id', 'created_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Integer, ForeignKey, DateTime, BigInteger
+from sqlalchemy import Index, Integer, Column, Integer, ForeignKey, DateTime, BigInteger
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -18,3 +18,7 @@ class OrderItem(Base):
     
     order = relationship("Order", backref="items")
     book = relationship("Book")
+
+    __table_args__ = (
+        Index('ix_order_item_order', 'order_id'), # loading an order's items
+    )
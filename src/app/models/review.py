@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Integer, Text, ForeignKey, DateTime, Enum, BigInteger, CheckConstraint
+from sqlalchemy import Index, Integer, Column, Integer, Text, ForeignKey, DateTime, Enum, BigInteger, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -30,4 +30,5 @@ class Review(Base):
     __table_args__ = (
         CheckConstraint('rating BETWEEN 1 AND 5', name='check_rating_range'),
         CheckConstraint('like_count >= 0', name='check_like_count_positive'),
+        Index('ix_review_book_status', 'book_id', 'status'),
     )
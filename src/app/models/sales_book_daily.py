@@ -0,0 +1,15 @@
+from sqlalchemy import Integer, Column, Date, ForeignKey, Index
+from app.db.base_class import Base
+
+class SalesBookDaily(Base):
+    """
+    Units and revenue per (day, book) over non-canceled orders.
+    """
+    day = Column(Date, primary_key=True)
+    book_id = Column(Integer, ForeignKey("book.book_id"), primary_key=True)
+    units = Column(Integer, default=0, nullable=False)
+    revenue = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index('ix_sales_book_daily_book_day', 'book_id', 'day'),
+    )
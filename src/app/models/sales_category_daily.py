@@ -0,0 +1,12 @@
+from sqlalchemy import Integer, Column, Date, String
+from app.db.base_class import Base
+
+class SalesCategoryDaily(Base):
+    """
+    Units and revenue per (day, category) over non-canceled orders. A book counts
+    toward each of its categories, so category rows don't sum to the daily totals.
+    """
+    day = Column(Date, primary_key=True)
+    category = Column(String(100), primary_key=True)
+    units = Column(Integer, default=0, nullable=False)
+    revenue = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Integer, Column, Date
+from app.db.base_class import Base
+
+class SalesDaily(Base):
+    """
+    Orders, units and revenue per day over non-canceled orders (by order date).
+    Maintained incrementally by create_order/cancel_order (see app/services/sales.py).
+    """
+    day = Column(Date, primary_key=True)
+    orders = Column(Integer, default=0, nullable=False)
+    units = Column(Integer, default=0, nullable=False)
+    revenue = Column(Integer, default=0, nullable=False)
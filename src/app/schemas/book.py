@@ -1,5 +1,6 @@
-from typing import Optional, List, Any
-from pydantic import BaseModel, ConfigDict
+from functools import lru_cache
+from typing import Optional, List, Any, Tuple, Type
+from pydantic import BaseModel, ConfigDict, create_model
 from datetime import datetime
 from app.models.book import BookStatus
 
@@ -57,6 +58,7 @@ class BookResponse(BookBase):
     book_id: int
     # seller_id: int # Removed
     discount_rate: int
+    effective_price: int
     average_rating: float
     review_count: int
     status: BookStatus
@@ -81,6 +83,7 @@ class BookResponse(BookBase):
                 "book_id": 1,
                 "seller_id": 1,
                 "discount_rate": 10,
+                "effective_price": 13500,
                 "average_rating": 4.5,
                 "review_count": 10,
                 "status": "ON_SALE",
@@ -89,3 +92,64 @@ class BookResponse(BookBase):
             }
         }
     )
+
+class BookBatchResponse(BaseModel):
+    content: List[BookResponse] # in request order
+    missing: List[int] = []
+    deleted: List[int] = []
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "content": [],
+                "missing": [999],
+                "deleted": [7]
+            }
+        }
+    )
+
+class BookSuggestion(BaseModel):
+    text: str
+    type: str # title | author
+    book_id: Optional[int] = None # set for title suggestions
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"text": "The Great Gatsby", "type": "title", "book_id": 1}
+        }
+    )
+
+class BookImportError(BaseModel):
+    row: int
+    isbn: Optional[str] = None
+    message: str
+
+class BookImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[BookImportError] = []
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "imported": 99998,
+                "failed": 2,
+                "errors": [
+                    {"row": 17, "isbn": "978-0451524935", "message": "A book with this ISBN already exists."},
+                    {"row": 42, "isbn": None, "message": "price: Input should be a valid integer"}
+                ]
+            }
+        }
+    )
+
+@lru_cache(maxsize=256)
+def book_fields_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    BookResponse reduced to the given fields (sparse fieldsets), built once per field set.
+    """
+    definitions = {name: (BookResponse.model_fields[name].annotation, ...) for name in fields}
+    return create_model(
+        "BookFields_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
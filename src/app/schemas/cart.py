@@ -1,5 +1,6 @@
-from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas.order import OrderBase
 
 class CartItemBase(BaseModel):
     book_id: int
@@ -15,6 +16,26 @@ class CartItemCreate(CartItemBase):
         }
     )
 
+class CartItemOperation(BaseModel):
+    op: Literal["add", "set", "remove"]
+    book_id: int
+    quantity: Optional[int] = Field(None, ge=1) # required for add/set
+
+class CartBatchUpdate(BaseModel):
+    operations: List[CartItemOperation] = Field(min_length=1)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "operations": [
+                    {"op": "add", "book_id": 1, "quantity": 1},
+                    {"op": "set", "book_id": 2, "quantity": 3},
+                    {"op": "remove", "book_id": 3}
+                ]
+            }
+        }
+    )
+
 class CartItemResponse(CartItemBase):
     cart_item_id: int
     unit_price: int
@@ -56,3 +77,15 @@ class CartResponse(BaseModel):
             }
         }
     )
+
+class CartCheckout(OrderBase):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "payment_method": "CARD",
+                "receiver_name": "John Doe",
+                "receiver_phone": "010-1234-5678",
+                "shipping_address": "Seoul, Korea"
+            }
+        }
+    )
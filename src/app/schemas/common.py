@@ -16,9 +16,11 @@ class PageResponse(BaseModel, Generic[T]):
     content: List[T]
     page: int
     size: int
-    totalElements: int
-    totalPages: int
+    totalElements: Optional[int] = None
+    totalPages: Optional[int] = None
     sort: Optional[str] = None
+    countMode: Optional[str] = None # exact | cached | estimate | none
+    hasNext: Optional[bool] = None
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -33,7 +35,43 @@ class PageResponse(BaseModel, Generic[T]):
                 "size": 20,
                 "totalElements": 100,
                 "totalPages": 5,
-                "sort": "created_at,desc"
+                "sort": "created_at,desc",
+                "countMode": "exact",
+                "hasNext": True
             }
         }
     )
+
+class CursorPageResponse(BaseModel, Generic[T]):
+    content: List[T]
+    size: int
+    sort: Optional[str] = None
+    nextCursor: Optional[str] = None
+    hasNext: bool
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "content": [
+                    {
+                        "id": 1,
+                        "name": "Example Item"
+                    }
+                ],
+                "size": 20,
+                "sort": "created_at,desc",
+                "nextCursor": "eyJzIjoiY3JlYXRlZF9hdCxkZXNjIiwiayI6IjIwMjUtMDEtMDEgMDA6MDA6MDAiLCJpZCI6MjB9",
+                "hasNext": True
+            }
+        }
+    )
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+class FacetedPageResponse(PageResponse[T], Generic[T]):
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+class FacetedCursorPageResponse(CursorPageResponse[T], Generic[T]):
+    facets: Optional[Dict[str, List[FacetCount]]] = None
@@ -69,3 +69,35 @@ class OrderResponse(OrderBase):
             }
         }
     )
+
+class OrderStatusBulkUpdate(BaseModel):
+    order_ids: List[int] = Field(min_length=1)
+    status: OrderStatus
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"order_ids": [101, 102, 103], "status": "SHIPPED"}
+        }
+    )
+
+class OrderTransitionResult(BaseModel):
+    order_id: int
+    result: str # updated | unchanged | invalid_transition | not_found
+    status: Optional[OrderStatus] = None # status after the request
+
+class OrderStatusBulkResult(BaseModel):
+    updated: int
+    results: List[OrderTransitionResult]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "updated": 2,
+                "results": [
+                    {"order_id": 101, "result": "updated", "status": "SHIPPED"},
+                    {"order_id": 102, "result": "updated", "status": "SHIPPED"},
+                    {"order_id": 103, "result": "invalid_transition", "status": "CANCELED"}
+                ]
+            }
+        }
+    )
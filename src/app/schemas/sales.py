@@ -0,0 +1,32 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class SalesRow(BaseModel):
+    day: Optional[date] = None # group_by=day
+    book_id: Optional[int] = None # group_by=book
+    title: Optional[str] = None
+    category: Optional[str] = None # group_by=category
+    orders: Optional[int] = None # group_by=day only
+    units: int
+    revenue: int
+
+class SalesReport(BaseModel):
+    group_by: str
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    rows: List[SalesRow]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "group_by": "day",
+                "date_from": "2025-03-01",
+                "date_to": "2025-03-02",
+                "rows": [
+                    {"day": "2025-03-01", "orders": 120, "units": 180, "revenue": 2340000},
+                    {"day": "2025-03-02", "orders": 95, "units": 130, "revenue": 1710000}
+                ]
+            }
+        }
+    )
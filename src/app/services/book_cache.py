@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import book_cache
+from app.models.book import Book
+
+_COLUMNS = tuple(column.key for column in Book.__table__.columns)
+
+
+def get_book(db: Session, book_id: int) -> Optional[SimpleNamespace]:
+    """
+    Read-through lookup of a book by primary key.
+
+    Returns a detached, read-only snapshot of the row's columns (or None if it
+    doesn't exist; misses aren't cached). Writes evict entries through
+    evict_books(), so snapshots are safe for fields like title, price and status;
+    anything that must be exact inside a write (e.g. stock when ordering) should
+    still be read from the session.
+    """
+    book = book_cache.get(book_id)
+    if book is not None:
+        return book
+    generation = book_cache.generation
+    row = db.query(Book).filter(Book.book_id == book_id).first()
+    if row is None:
+        return None
+    book = SimpleNamespace(**{name: getattr(row, name) for name in _COLUMNS})
+    # Not stored if a write evicted anything while the row was being read
+    book_cache.set(book_id, book, generation=generation)
+    return book
@@ -0,0 +1,69 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.book import Book, BookStatus
+
+# Exported columns, in CSV header order (BookResponse fields)
+EXPORT_FIELDS = (
+    "book_id", "title", "authors", "categories", "publisher", "summary", "isbn",
+    "price", "discount_rate", "effective_price", "stock", "average_rating", "review_count",
+    "cover_image", "publication_date", "status", "subcategory", "created_at", "updated_at",
+)
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _rows(db: Session, since: Optional[datetime], include_deleted: bool, batch_size: int) -> Iterator[List[Any]]:
+    """
+    One query over the book table, fetched batch_size rows at a time through a
+    server-side cursor (yield_per implies stream_results), so memory stays flat.
+    """
+    query = db.query(*(getattr(Book, name) for name in EXPORT_FIELDS))
+    if since is not None:
+        query = query.filter(Book.updated_at >= since)
+    if not include_deleted:
+        query = query.filter(Book.status != BookStatus.DELETED)
+    query = query.order_by(Book.book_id).execution_options(yield_per=batch_size)
+    for row in query:
+        yield [_value(value) for value in row]
+
+
+def export_ndjson(db: Session, since: Optional[datetime], include_deleted: bool, batch_size: int) -> Iterator[str]:
+    lines: List[str] = []
+    for row in _rows(db, since, include_deleted, batch_size):
+        lines.append(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n")
+        if len(lines) >= batch_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def export_csv(db: Session, since: Optional[datetime], include_deleted: bool, batch_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    written = 0
+    for row in _rows(db, since, include_deleted, batch_size):
+        writer.writerow(row)
+        written += 1
+        if written % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
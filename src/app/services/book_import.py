@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.schemas.book import BookCreate
+from app.services import catalog, search
+
+# An error report for a 100k-row file is capped so the response stays bounded
+MAX_REPORTED_ERRORS = 1000
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for row_number, row in enumerate(csv.DictReader(text), start=1):
+        # Empty CSV cells mean "not provided" for optional fields
+        yield row_number, {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def _ndjson_rows(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    row_number = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, e
+
+
+def _format_errors(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(x) for x in error['loc'])}: {error['msg']}" for error in e.errors())
+
+
+class BookImporter:
+    """
+    Streams rows from an upload into the book table in chunks.
+
+    Each chunk costs one ISBN lookup (IN query), one executemany INSERT and one
+    commit; rows that fail validation or collide on ISBN are reported, not raised.
+    """
+
+    def __init__(self, db: Session, chunk_size: int):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._seen_isbns: Set[str] = set()
+
+    def _error(self, row_number: int, message: str, isbn: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "isbn": isbn, "message": message})
+
+    def run(self, rows: Iterator[Tuple[int, Any]]) -> Dict[str, Any]:
+        chunk: List[Tuple[int, BookCreate]] = []
+        for row_number, raw in rows:
+            if isinstance(raw, Exception):
+                self._error(row_number, f"Invalid JSON: {raw}")
+                continue
+            try:
+                book_in = BookCreate.model_validate(raw)
+            except ValidationError as e:
+                self._error(row_number, _format_errors(e), raw.get("isbn") if isinstance(raw, dict) else None)
+                continue
+            if book_in.isbn in self._seen_isbns:
+                self._error(row_number, "Duplicate ISBN in upload", book_in.isbn)
+                continue
+            self._seen_isbns.add(book_in.isbn)
+            chunk.append((row_number, book_in))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        if chunk:
+            self._flush(chunk)
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def _flush(self, chunk: List[Tuple[int, BookCreate]]) -> None:
+        isbns = [book_in.isbn for _, book_in in chunk]
+        existing = {
+            isbn for (isbn,) in self.db.query(Book.isbn).filter(Book.isbn.in_(isbns))
+        }
+        new_rows = []
+        for row_number, book_in in chunk:
+            if book_in.isbn in existing:
+                self._error(row_number, "A book with this ISBN already exists.", book_in.isbn)
+            else:
+                new_rows.append((row_number, book_in))
+        if not new_rows:
+            return
+
+        try:
+            self._insert([book_in for _, book_in in new_rows])
+            self.db.commit()
+            self.imported += len(new_rows)
+        except IntegrityError:
+            # Lost a race with a concurrent writer; isolate the offending rows
+            self.db.rollback()
+            for row_number, book_in in new_rows:
+                try:
+                    self._insert([book_in])
+                    self.db.commit()
+                    self.imported += 1
+                except IntegrityError as e:
+                    self.db.rollback()
+                    self._error(row_number, str(e.orig), book_in.isbn)
+
+    def _insert(self, books: List[BookCreate]) -> None:
+        self.db.execute(insert(Book), [book_in.model_dump() for book_in in books])
+        # Fetch ids of the new rows to maintain the term tables and search index
+        inserted = (
+            self.db.query(Book.book_id, Book.title, Book.authors, Book.categories, Book.publisher, Book.summary)
+            .filter(Book.isbn.in_([book_in.isbn for book_in in books]))
+            .all()
+        )
+        catalog.sync_terms(self.db, inserted)
+        search.index_books(self.db, inserted)
+
+
+def import_books(db: Session, stream: BinaryIO, fmt: str, chunk_size: int) -> Dict[str, Any]:
+    """
+    Import a CSV (header row with BookCreate field names) or NDJSON stream.
+    """
+    rows = _csv_rows(stream) if fmt == "csv" else _ndjson_rows(stream)
+    return BookImporter(db, chunk_size).run(rows)
@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.book import Book
+from app.models.cart import Cart, CartStatus
+from app.models.cart_item import CartItem
+from app.schemas.cart import CartItemOperation
+
+
+def active_cart(db: Session, user_id: int, create: bool = False) -> Optional[Cart]:
+    """
+    The user's ACTIVE cart, created (and flushed) on demand when `create` is set.
+    """
+    cart = db.query(Cart).filter(
+        Cart.user_id == user_id,
+        Cart.status == CartStatus.ACTIVE
+    ).first()
+    if not cart and create:
+        cart = Cart(user_id=user_id, status=CartStatus.ACTIVE)
+        db.add(cart)
+        db.flush()
+    return cart
+
+
+def add_cart_lines(db: Session, cart_id: int, lines: List[Tuple[int, int, int]]) -> None:
+    """
+    Add (book_id, quantity, unit_price) lines to a cart in one upsert. Existing
+    lines keep their unit_price and grow by quantity; soft-deleted ones restart
+    from the new quantity and price.
+    """
+    table = CartItem.__table__
+    deleted = table.c.deleted_at.isnot(None)
+    upsert(
+        db, table,
+        [{"cart_id": cart_id, "book_id": book_id, "quantity": quantity, "unit_price": price,
+          "discount_rate": 0, "subtotal": price * quantity, "deleted_at": None}
+         for book_id, quantity, price in lines],
+        keys=("cart_id", "book_id"),
+        # deleted_at must be assigned last: the others read it
+        expressions={
+            "quantity": lambda new: case((deleted, new.quantity), else_=table.c.quantity + new.quantity),
+            "unit_price": lambda new: case((deleted, new.unit_price), else_=table.c.unit_price),
+            "subtotal": lambda new: case((deleted, new.subtotal), else_=table.c.subtotal + table.c.unit_price * new.quantity),
+            "updated_at": lambda new: func.now(),
+            "deleted_at": lambda new: new.deleted_at,
+        },
+    )
+
+
+def apply_operations(db: Session, cart: Cart, operations: List[CartItemOperation]) -> List[CartItem]:
+    """
+    Apply add/set/remove operations in order to a cart and recompute its total
+    (caller commits). Costs one IN query for the books being added or set, one
+    for the cart's lines of the referenced books (soft-deleted ones included, so
+    they can be revived), one flush and one UPDATE of the total from the lines.
+    Unknown books raise 404; set/remove of a book not in the cart raises 404.
+    Returns the cart's live lines (one more SELECT).
+    """
+    for operation in operations:
+        if operation.op != "remove" and operation.quantity is None:
+            raise HTTPException(status_code=400, detail=f"quantity is required to {operation.op} book {operation.book_id}")
+
+    priced_ids = {operation.book_id for operation in operations if operation.op != "remove"}
+    prices = dict(db.query(Book.book_id, Book.price).filter(Book.book_id.in_(priced_ids))) if priced_ids else {}
+    for book_id in priced_ids:
+        if book_id not in prices:
+            raise HTTPException(status_code=404, detail=f"Book {book_id} not found")
+
+    lines: Dict[int, CartItem] = {
+        line.book_id: line
+        for line in db.query(CartItem).filter(
+            CartItem.cart_id == cart.cart_id,
+            CartItem.book_id.in_({operation.book_id for operation in operations})
+        )
+    }
+    for operation in operations:
+        line = lines.get(operation.book_id)
+        live = line is not None and line.deleted_at is None
+        if operation.op != "add" and not live:
+            raise HTTPException(status_code=404, detail=f"Item not in cart: book {operation.book_id}")
+        if operation.op == "remove":
+            line.deleted_at = datetime.now()
+            continue
+        if line is None:
+            line = lines[operation.book_id] = CartItem(
+                cart_id=cart.cart_id, book_id=operation.book_id, quantity=0, unit_price=prices[operation.book_id]
+            )
+            db.add(line)
+        elif not live:
+            # Revived at the current price
+            line.deleted_at = None
+            line.quantity = 0
+            line.unit_price = prices[operation.book_id]
+        line.quantity = line.quantity + operation.quantity if operation.op == "add" else operation.quantity
+        line.subtotal = line.quantity * line.unit_price
+
+    db.flush()
+    cart.total_amount = (
+        db.query(func.coalesce(func.sum(CartItem.subtotal), 0))
+        .filter(CartItem.cart_id == cart.cart_id, CartItem.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+    db.flush()
+    return db.query(CartItem).filter(CartItem.cart_id == cart.cart_id, CartItem.deleted_at.is_(None)).order_by(CartItem.cart_item_id).all()
@@ -0,0 +1,105 @@
+import ast
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.book_author import BookAuthor
+from app.models.book_category import BookCategory
+
+
+def parse_names(value: Any) -> List[str]:
+    """
+    Parse a Book.authors / Book.categories value into a list of names.
+
+    The columns hold JSON arrays, but older rows were written with Python list
+    reprs ("['Fiction']") or as plain strings; all three are accepted.
+    """
+    if value is None:
+        return []
+    items: Any = value
+    if isinstance(value, str):
+        try:
+            items = json.loads(value)
+        except ValueError:
+            try:
+                items = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                items = value
+    if isinstance(items, str):
+        items = [items]
+    if not isinstance(items, (list, tuple)):
+        return []
+
+    names: List[str] = []
+    for item in items:
+        name = str(item).strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _term_rows(book_id: int, value: Any, max_length: int) -> List[Dict[str, Any]]:
+    return [
+        {"book_id": book_id, "name": name[:max_length], "position": position}
+        for position, name in enumerate(parse_names(value))
+    ]
+
+
+def sync_book_terms(db: Session, book: Book) -> None:
+    """
+    Rewrite the book_category / book_author rows of one book (caller commits).
+    """
+    db.query(BookCategory).filter(BookCategory.book_id == book.book_id).delete(synchronize_session=False)
+    db.query(BookAuthor).filter(BookAuthor.book_id == book.book_id).delete(synchronize_session=False)
+    category_rows = _term_rows(book.book_id, book.categories, BookCategory.name.type.length)
+    author_rows = _term_rows(book.book_id, book.authors, BookAuthor.name.type.length)
+    if category_rows:
+        db.execute(insert(BookCategory), category_rows)
+    if author_rows:
+        db.execute(insert(BookAuthor), author_rows)
+
+
+def sync_terms(db: Session, chunk: List[Any]) -> None:
+    """
+    Rewrite the rows of many books at once: one DELETE ... IN and one executemany
+    INSERT per table. Rows need book_id, authors and categories (caller commits).
+    """
+    ids = [row.book_id for row in chunk]
+    db.query(BookCategory).filter(BookCategory.book_id.in_(ids)).delete(synchronize_session=False)
+    db.query(BookAuthor).filter(BookAuthor.book_id.in_(ids)).delete(synchronize_session=False)
+    category_rows: List[Dict[str, Any]] = []
+    author_rows: List[Dict[str, Any]] = []
+    for row in chunk:
+        category_rows.extend(_term_rows(row.book_id, row.categories, BookCategory.name.type.length))
+        author_rows.extend(_term_rows(row.book_id, row.authors, BookAuthor.name.type.length))
+    if category_rows:
+        db.execute(insert(BookCategory), category_rows)
+    if author_rows:
+        db.execute(insert(BookAuthor), author_rows)
+
+
+def rebuild_book_terms(db: Session, batch_size: int = 1000) -> int:
+    """
+    Backfill book_category / book_author from the JSON columns of every book.
+    Walks the book table by primary key in chunks of batch_size (one commit each)
+    so memory stays flat; returns the number of books processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        chunk = (
+            db.query(Book.book_id, Book.authors, Book.categories)
+            .filter(Book.book_id > last_id)
+            .order_by(Book.book_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not chunk:
+            return processed
+        sync_terms(db, chunk)
+        db.commit()
+        processed += len(chunk)
+        last_id = chunk[-1].book_id
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import case, func, literal, select, union_all
+from sqlalchemy.orm import Query, Session
+
+from app.core.cache import facet_cache
+from app.models.book import Book
+from app.models.book_category import BookCategory
+
+FACETS = ("category", "publisher", "price")
+
+# Upper bounds of the (sale) price buckets; the last bucket is open-ended
+PRICE_BUCKETS = (10000, 20000, 30000, 50000)
+
+# Values returned per facet, most frequent first
+MAX_FACET_VALUES = 20
+
+
+PRICE_LABELS = tuple(
+    f"{lower}-{upper}" for lower, upper in zip((0,) + PRICE_BUCKETS, PRICE_BUCKETS)
+) + (f"{PRICE_BUCKETS[-1]}+",)
+
+
+def _price_bucket(price: Any) -> Any:
+    whens = [(price < upper, literal(label)) for upper, label in zip(PRICE_BUCKETS, PRICE_LABELS)]
+    return case(*whens, else_=literal(PRICE_LABELS[-1]))
+
+
+def compute_facets(db: Session, query: Query, names: Tuple[str, ...], cache_key: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Count books per facet value for everything matched by a (filtered) Book query.
+
+    All requested facets are computed in one statement: the matching ids are a CTE
+    and each facet is a GROUP BY branch of a UNION ALL. Results are cached per
+    search (cache_key), so paging through the same results reuses them.
+    """
+    cached = facet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = facet_cache.generation
+
+    ids = query.with_entities(Book.book_id.label("book_id")).order_by(None).cte("facet_books")
+    branches = []
+    if "category" in names:
+        branches.append(
+            select(literal("category").label("facet"), BookCategory.name.label("value"), func.count().label("count"))
+            .join(ids, ids.c.book_id == BookCategory.book_id)
+            .group_by(BookCategory.name)
+        )
+    if "publisher" in names:
+        branches.append(
+            select(literal("publisher").label("facet"), Book.publisher.label("value"), func.count().label("count"))
+            .join(ids, ids.c.book_id == Book.book_id)
+            .group_by(Book.publisher)
+        )
+    if "price" in names:
+        bucket = _price_bucket(Book.effective_price)
+        branches.append(
+            select(literal("price").label("facet"), bucket.label("value"), func.count().label("count"))
+            .join(ids, ids.c.book_id == Book.book_id)
+            .group_by(bucket)
+        )
+
+    facets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+    for facet, value, count in db.execute(union_all(*branches)):
+        facets[facet].append({"value": value, "count": count})
+    for name, values in facets.items():
+        if name == "price":
+            values.sort(key=lambda v: PRICE_LABELS.index(v["value"]))
+        else:
+            values.sort(key=lambda v: (-v["count"], str(v["value"])))
+            del values[MAX_FACET_VALUES:]
+
+    facet_cache.set(cache_key, facets, tags=("books",), generation=generation)
+    return facets
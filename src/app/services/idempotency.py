@@ -0,0 +1,88 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Union
+
+from fastapi import HTTPException, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+
+def request_hash(payload: Any) -> str:
+    """
+    Hash of a request body (JSON-compatible data), independent of key order.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _replay(db: Session, user_id: int, key: str, payload_hash: str) -> Union[Response, None]:
+    record = db.get(IdempotencyKey, (user_id, key))
+    if record is None:
+        return None
+    if record.expires_at <= datetime.now():
+        db.delete(record)
+        db.flush()
+        return None
+    if record.request_hash != payload_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request body")
+    return Response(
+        content=record.response_body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def begin(db: Session, user_id: int, key: str, payload_hash: str) -> Union[Response, IdempotencyKey]:
+    """
+    Start a keyed request: returns the stored response for a retry, or a new
+    record to be completed in the caller's transaction.
+
+    The record is inserted (primary key (user_id, key)) before the work is done,
+    so a concurrent retry blocks on the row and, once the first request commits,
+    fails the insert and replays its response instead of repeating the work.
+    """
+    replay = _replay(db, user_id, key, payload_hash)
+    if replay is not None:
+        return replay
+    record = IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=payload_hash,
+        expires_at=datetime.now() + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    db.add(record)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        replay = _replay(db, user_id, key, payload_hash)
+        if replay is None:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is already in progress")
+        return replay
+    return record
+
+
+def complete(record: IdempotencyKey, status_code: int, body: str) -> None:
+    """
+    Store the response to replay; committed together with the request's own writes.
+    """
+    record.status_code = status_code
+    record.response_body = body
+
+
+def purge_expired(db: Session) -> int:
+    """
+    Delete expired keys (indexed on expires_at); returns how many were removed.
+    """
+    deleted = (
+        db.query(IdempotencyKey)
+        .filter(IdempotencyKey.expires_at <= datetime.now())
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -0,0 +1,136 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import Order
+from app.schemas.order import OrderCreate
+from app.services.ordering import orders_committed, place_order
+
+logger = logging.getLogger("api")
+
+# (engine, user_id, order, caller's future)
+Entry = Tuple[Engine, int, OrderCreate, Future]
+
+
+class OrderQueue:
+    """
+    Group commit for order placement.
+
+    Callers put validated orders on an in-process queue and block on a future.
+    One worker thread takes up to max_batch orders (waiting at most max_wait_ms
+    after the first one for the batch to fill) and places them all in a single
+    transaction, each inside its own SAVEPOINT: an order that fails (unknown
+    book, out of stock, ...) is rolled back alone and its caller gets the error,
+    while the rest of the batch commits together. One commit (one log flush on
+    MySQL) is then shared by the whole batch instead of paid per order.
+
+    Only helps where commits dominate (bursts of small orders); under light load
+    a batch is a single order that waited up to max_wait_ms.
+    """
+
+    def __init__(self, max_batch: Optional[int] = None, max_wait_ms: Optional[int] = None):
+        self.max_batch = max_batch or settings.ORDER_INGEST_MAX_BATCH
+        self.max_wait_ms = settings.ORDER_INGEST_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self._queue: "queue.Queue[Entry]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.batches = 0
+        self.orders = 0
+
+    def submit(self, db: Session, user_id: int, order_in: OrderCreate, timeout: Optional[float] = None) -> Order:
+        """
+        Queue an order and wait for it to be committed. Returns the committed
+        (detached, fully loaded) Order or raises what placing it raised. The
+        batch uses its own sessions on db's engine; db itself is not touched.
+
+        If the order is still queued after `timeout` seconds it is withdrawn and
+        a 503 raised; once its batch has started, the result is always awaited.
+        """
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((db.get_bind(), user_id, order_in, future))
+        try:
+            return future.result(timeout or settings.ORDER_INGEST_TIMEOUT_SECONDS)
+        except TimeoutError:
+            if future.cancel():
+                raise HTTPException(status_code=503, detail="Order queue is busy, please retry")
+            return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "orders": self.orders,
+            "queued": self._queue.qsize(),
+            "avgBatchSize": round(self.orders / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="order-ingest", daemon=True)
+                self._worker.start()
+
+    def _next_batch(self) -> List[Entry]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = [entry for entry in self._next_batch() if entry[3].set_running_or_notify_cancel()]
+            by_engine: Dict[Engine, List[Entry]] = {}
+            for entry in batch:
+                by_engine.setdefault(entry[0], []).append(entry)
+            for engine, entries in by_engine.items():
+                try:
+                    self._place(engine, entries)
+                except Exception as e: # never let the worker die with callers waiting
+                    logger.exception("Order ingest batch failed")
+                    for entry in entries:
+                        if not entry[3].done():
+                            entry[3].set_exception(e)
+
+    def _place(self, engine: Engine, entries: List[Entry]) -> None:
+        placed: List[Tuple[Order, Future]] = []
+        db = Session(bind=engine, autoflush=False, expire_on_commit=False)
+        try:
+            for _, user_id, order_in, future in entries:
+                try:
+                    with db.begin_nested():
+                        placed.append((place_order(db, user_id, order_in), future))
+                except Exception as e:
+                    future.set_exception(e)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for _, future in placed:
+                future.set_exception(e)
+            return
+        finally:
+            db.close()
+
+        self.batches += 1
+        self.orders += len(placed)
+        try:
+            orders_committed(order for order, _ in placed)
+        except Exception: # committed regardless; caches only refresh late
+            logger.exception("Order ingest cache refresh failed")
+        for order, future in placed:
+            future.set_result(order)
+
+
+order_queue = OrderQueue()
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderStatus
+
+# Target status -> (statuses it may be reached from, timestamp column it stamps).
+# Cancellation restores stock and goes through PATCH /orders/{id}/cancel instead.
+TRANSITIONS = {
+    OrderStatus.PAID: ((OrderStatus.CREATED,), "paid_at"),
+    OrderStatus.SHIPPED: ((OrderStatus.PAID,), "shipped_at"),
+    OrderStatus.COMPLETED: ((OrderStatus.SHIPPED,), "completed_at"),
+}
+
+
+def bulk_transition(db: Session, order_ids: List[int], target: OrderStatus) -> Dict[str, Any]:
+    """
+    Move many orders to `target` with one SELECT plus one set-based UPDATE per
+    allowed source status (the WHERE repeats the source status, so an order
+    changed concurrently is left alone). The caller commits once.
+
+    Returns per-id results in request order: updated, unchanged (already at
+    target), invalid_transition or not_found.
+    """
+    sources, stamp = TRANSITIONS[target]
+    ids = list(dict.fromkeys(order_ids))
+    current = dict(db.query(Order.order_id, Order.status).filter(Order.order_id.in_(ids)))
+
+    now = datetime.now()
+    updated = set()
+    for source in sources:
+        candidates = [order_id for order_id in ids if current.get(order_id) == source]
+        if not candidates:
+            continue
+        count = (
+            db.query(Order)
+            .filter(Order.order_id.in_(candidates), Order.status == source)
+            .update({Order.status: target, getattr(Order, stamp): now}, synchronize_session=False)
+        )
+        if count != len(candidates):
+            # Some orders moved between the SELECT and the UPDATE; report where they are now
+            current.update(db.query(Order.order_id, Order.status).filter(Order.order_id.in_(candidates)))
+            candidates = [order_id for order_id in candidates if current[order_id] == target]
+        updated.update(candidates)
+
+    results = []
+    for order_id in ids:
+        if order_id not in current:
+            results.append({"order_id": order_id, "result": "not_found", "status": None})
+        elif order_id in updated:
+            results.append({"order_id": order_id, "result": "updated", "status": target})
+        elif current[order_id] == target:
+            results.append({"order_id": order_id, "result": "unchanged", "status": target})
+        else:
+            results.append({"order_id": order_id, "result": "invalid_transition", "status": current[order_id]})
+    return {"updated": len(updated), "results": results}
@@ -0,0 +1,76 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.cache import evict_books
+from app.core.pagination import count_cache
+from app.models.book import Book
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.schemas.order import OrderCreate
+from app.services import sales
+from app.services.stock import order_quantities, reserve_stock
+from app.services.suggest import suggest_index
+
+
+def place_order(db: Session, user_id: int, order_in: OrderCreate) -> Order:
+    """
+    Validate an order, reserve its stock and add it with its items and sales
+    rollups to the session. Nothing is committed; on failure an HTTPException is
+    raised and the caller must roll back (the stock UPDATE may have run).
+
+    Costs one SELECT for the books, one conditional UPDATE for stock, one flush
+    for the order and its items, and the rollup upserts.
+    """
+    # Optimized: Fetch all books in one query (not from the book cache: stock must be current)
+    book_ids = [item.book_id for item in order_in.items]
+    books = db.query(Book).filter(Book.book_id.in_(book_ids)).all()
+    books_map = {b.book_id: b for b in books}
+    for book_id in book_ids:
+        if book_id not in books_map:
+            raise HTTPException(status_code=404, detail=f"Book {book_id} not found")
+
+    # Check and decrement stock for all items in one conditional UPDATE
+    reserve_stock(db, books_map, order_quantities((item.book_id, item.quantity) for item in order_in.items))
+
+    items = [
+        OrderItem(
+            book_id=item.book_id,
+            quantity=item.quantity,
+            unit_price=books_map[item.book_id].price,
+            subtotal=books_map[item.book_id].price * item.quantity
+        )
+        for item in order_in.items
+    ]
+    total_price = sum(item.subtotal for item in items)
+    db_order = Order(
+        user_id=user_id,
+        payment_method=order_in.payment_method,
+        receiver_name=order_in.receiver_name,
+        receiver_phone=order_in.receiver_phone,
+        shipping_address=order_in.shipping_address,
+        total_price=total_price,
+        final_price=total_price, # Apply discount logic here if needed
+        status=OrderStatus.CREATED
+    )
+    db_order.items = items
+    db.add(db_order)
+    db.flush()
+    sales.record_order(db, db_order.created_at.date(), [(i.book_id, i.quantity, i.subtotal) for i in items])
+    return db_order
+
+
+def orders_committed(orders: Iterable[Order]) -> None:
+    """
+    Refresh process-local caches after orders were committed.
+    """
+    orders = list(orders)
+    if not orders:
+        return
+    count_cache.invalidate("orders")
+    book_ids = {item.book_id for order in orders for item in order.items}
+    evict_books(*book_ids) # stock changed
+    for order in orders:
+        for item in order.items:
+            suggest_index.bump(item.book_id, item.quantity)
@@ -0,0 +1,167 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.book import Book
+from app.models.book_category import BookCategory
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.sales_book_daily import SalesBookDaily
+from app.models.sales_category_daily import SalesCategoryDaily
+from app.models.sales_daily import SalesDaily
+
+GROUPINGS = ("day", "book", "category")
+
+# (book_id, quantity, subtotal) of one order line
+Line = Tuple[int, int, int]
+
+
+def _categories(db: Session, book_ids: Iterable[int]) -> Dict[int, List[str]]:
+    categories: Dict[int, List[str]] = {}
+    for book_id, name in db.query(BookCategory.book_id, BookCategory.name).filter(BookCategory.book_id.in_(list(book_ids))):
+        categories.setdefault(book_id, []).append(name)
+    return categories
+
+
+def _rollup(lines: Iterable[Line], categories: Dict[int, List[str]]) -> Tuple[Dict[int, List[int]], Dict[str, List[int]], List[int]]:
+    """
+    Sum lines into [units, revenue] per book, per category and overall.
+    """
+    books: Dict[int, List[int]] = {}
+    by_category: Dict[str, List[int]] = {}
+    total = [0, 0]
+    for book_id, quantity, subtotal in lines:
+        for bucket in [books.setdefault(book_id, [0, 0]), total] + [
+            by_category.setdefault(name, [0, 0]) for name in categories.get(book_id, [])
+        ]:
+            bucket[0] += quantity
+            bucket[1] += subtotal
+    return books, by_category, total
+
+
+def record_order(db: Session, day: date, lines: List[Line], sign: int = 1) -> None:
+    """
+    Add an order's lines to the rollups of its day (sign=-1 takes a canceled
+    order back out). One upsert per rollup table; runs in the caller's transaction.
+    """
+    books, by_category, total = _rollup(lines, _categories(db, {line[0] for line in lines}))
+    upsert(
+        db, SalesDaily.__table__,
+        [{"day": day, "orders": sign, "units": sign * total[0], "revenue": sign * total[1]}],
+        keys=("day",), increment=("orders", "units", "revenue"),
+    )
+    upsert(
+        db, SalesBookDaily.__table__,
+        [{"day": day, "book_id": book_id, "units": sign * units, "revenue": sign * revenue}
+         for book_id, (units, revenue) in books.items()],
+        keys=("day", "book_id"), increment=("units", "revenue"),
+    )
+    upsert(
+        db, SalesCategoryDaily.__table__,
+        [{"day": day, "category": name, "units": sign * units, "revenue": sign * revenue}
+         for name, (units, revenue) in by_category.items()],
+        keys=("day", "category"), increment=("units", "revenue"),
+    )
+
+
+def rebuild(db: Session, batch_size: int = 10000) -> int:
+    """
+    Recompute every rollup from order history in one streaming pass over the
+    non-canceled order lines (server-side cursor, batch_size rows at a time),
+    then swap the tables' contents in one transaction. Returns the number of days.
+    """
+    categories: Dict[int, List[str]] = {}
+    for book_id, name in db.query(BookCategory.book_id, BookCategory.name).execution_options(yield_per=batch_size):
+        categories.setdefault(book_id, []).append(name)
+
+    daily: Dict[date, List[int]] = {}
+    book_daily: Dict[Tuple[date, int], List[int]] = {}
+    category_daily: Dict[Tuple[date, str], List[int]] = {}
+    last_order_id = None
+    rows = (
+        db.query(Order.order_id, Order.created_at, OrderItem.book_id, OrderItem.quantity, OrderItem.subtotal)
+        .join(OrderItem, OrderItem.order_id == Order.order_id)
+        .filter(Order.status != OrderStatus.CANCELED)
+        .order_by(Order.order_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for order_id, created_at, book_id, quantity, subtotal in rows:
+        day = created_at.date()
+        totals = daily.setdefault(day, [0, 0, 0])
+        if order_id != last_order_id:
+            totals[0] += 1
+            last_order_id = order_id
+        totals[1] += quantity
+        totals[2] += subtotal
+        for bucket in [book_daily.setdefault((day, book_id), [0, 0])] + [
+            category_daily.setdefault((day, name), [0, 0]) for name in categories.get(book_id, [])
+        ]:
+            bucket[0] += quantity
+            bucket[1] += subtotal
+
+    for model in (SalesDaily, SalesBookDaily, SalesCategoryDaily):
+        db.query(model).delete(synchronize_session=False)
+    if daily:
+        db.execute(SalesDaily.__table__.insert(), [
+            {"day": day, "orders": orders, "units": units, "revenue": revenue}
+            for day, (orders, units, revenue) in daily.items()
+        ])
+    if book_daily:
+        db.execute(SalesBookDaily.__table__.insert(), [
+            {"day": day, "book_id": book_id, "units": units, "revenue": revenue}
+            for (day, book_id), (units, revenue) in book_daily.items()
+        ])
+    if category_daily:
+        db.execute(SalesCategoryDaily.__table__.insert(), [
+            {"day": day, "category": name, "units": units, "revenue": revenue}
+            for (day, name), (units, revenue) in category_daily.items()
+        ])
+    db.commit()
+    return len(daily)
+
+
+def report(
+    db: Session,
+    group_by: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """
+    Sales between date_from and date_to (inclusive) from the rollups only:
+    per day (chronological), or the top `limit` books/categories by revenue.
+    """
+    model = {"day": SalesDaily, "book": SalesBookDaily, "category": SalesCategoryDaily}[group_by]
+    filters = []
+    if date_from is not None:
+        filters.append(model.day >= date_from)
+    if date_to is not None:
+        filters.append(model.day <= date_to)
+
+    if group_by == "day":
+        rows = db.query(SalesDaily).filter(*filters).order_by(SalesDaily.day)
+        return [
+            {"day": row.day, "orders": row.orders, "units": row.units, "revenue": row.revenue}
+            for row in rows
+        ]
+
+    key = model.book_id if group_by == "book" else model.category
+    revenue = func.sum(model.revenue)
+    rows = (
+        db.query(key, func.sum(model.units), revenue)
+        .filter(*filters)
+        .group_by(key)
+        .order_by(revenue.desc(), key)
+        .limit(limit)
+        .all()
+    )
+    if group_by == "category":
+        return [{"category": name, "units": int(units), "revenue": int(total)} for name, units, total in rows]
+    titles = dict(db.query(Book.book_id, Book.title).filter(Book.book_id.in_([row[0] for row in rows])))
+    return [
+        {"book_id": book_id, "title": titles.get(book_id), "units": int(units), "revenue": int(total)}
+        for book_id, units, total in rows
+    ]
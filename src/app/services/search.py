@@ -0,0 +1,138 @@
+import re
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import inspect, literal_column, or_, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import column, table
+
+from app.models.book import Book, BookStatus, BOOK_FTS_DDL, BOOK_FULLTEXT_DDL
+
+# Lightweight handle on the SQLite FTS5 table (not part of Base.metadata)
+book_fts = table("book_fts", column("rowid"), column("rank"))
+
+_INDEX_SQL = text(
+    "INSERT INTO book_fts (rowid, title, authors, publisher, summary) "
+    "VALUES (:book_id, :title, :authors, :publisher, :summary)"
+)
+_REMOVE_SQL = text("DELETE FROM book_fts WHERE rowid = :book_id")
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def _terms(keyword: str) -> List[str]:
+    # Only word characters reach the engine, so user input can't inject query syntax
+    return re.findall(r"\w+", keyword)
+
+
+def apply_search(db: Session, query: Query, keyword: str) -> Tuple[Query, Optional[Any]]:
+    """
+    Filter a Book query by keyword through the search index.
+
+    Returns the filtered query and a relevance score expression (higher is better),
+    or None when the backend has no index and falls back to LIKE.
+    """
+    terms = _terms(keyword)
+    dialect = _dialect(db)
+
+    if terms and dialect == "sqlite":
+        expression = " ".join(f'"{term}"*' for term in terms)
+        query = query.join(book_fts, book_fts.c.rowid == Book.book_id).filter(
+            literal_column("book_fts").op("MATCH")(expression)
+        )
+        # FTS5 rank is bm25, where lower (more negative) is more relevant
+        return query, -book_fts.c.rank
+
+    if terms and dialect == "mysql":
+        expression = " ".join(f"+{term}*" for term in terms)
+        score = match(Book.title, Book.authors, Book.publisher, Book.summary, against=expression).in_boolean_mode()
+        return query.filter(score > 0), score
+
+    pattern = f"%{keyword}%"
+    return query.filter(or_(
+        Book.title.ilike(pattern),
+        Book.authors.ilike(pattern),
+        Book.publisher.ilike(pattern),
+        Book.summary.ilike(pattern),
+    )), None
+
+
+def index_book(db: Session, book: Book) -> None:
+    """
+    Add or refresh a book in the index (within the caller's transaction).
+    """
+    if _dialect(db) != "sqlite":
+        return  # FULLTEXT indexes are maintained by MySQL itself
+    db.execute(_REMOVE_SQL, {"book_id": book.book_id})
+    if book.status == BookStatus.DELETED:
+        return
+    db.execute(_INDEX_SQL, {
+        "book_id": book.book_id,
+        "title": book.title,
+        "authors": book.authors,
+        "publisher": book.publisher,
+        "summary": book.summary,
+    })
+
+
+def index_books(db: Session, rows: List[Any]) -> None:
+    """
+    Add many newly inserted books in one executemany (within the caller's transaction).
+    Rows need book_id, title, authors, publisher and summary.
+    """
+    if _dialect(db) != "sqlite" or not rows:
+        return
+    db.execute(_INDEX_SQL, [
+        {
+            "book_id": row.book_id,
+            "title": row.title,
+            "authors": row.authors,
+            "publisher": row.publisher,
+            "summary": row.summary,
+        }
+        for row in rows
+    ])
+
+
+def remove_book(db: Session, book_id: int) -> None:
+    """
+    Drop a book from the index (within the caller's transaction).
+    """
+    if _dialect(db) == "sqlite":
+        db.execute(_REMOVE_SQL, {"book_id": book_id})
+
+
+def rebuild_index(db: Session) -> None:
+    """
+    Re-populate the index from the book table in one statement.
+    Needed after bulk loads that bypass the books endpoints (seeds, scripts).
+    """
+    if _dialect(db) != "sqlite":
+        return
+    db.execute(text(BOOK_FTS_DDL))
+    db.execute(text("DELETE FROM book_fts"))
+    db.execute(
+        text(
+            "INSERT INTO book_fts (rowid, title, authors, publisher, summary) "
+            "SELECT book_id, title, authors, publisher, summary FROM book WHERE status != :deleted"
+        ),
+        {"deleted": BookStatus.DELETED.name},
+    )
+    db.commit()
+
+
+def ensure_index(engine: Engine) -> None:
+    """
+    Create the search index on databases whose book table predates it.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text(BOOK_FTS_DDL))
+        elif engine.dialect.name == "mysql":
+            names = {ix["name"] for ix in inspector.get_indexes("book")}
+            if "ft_book_search" not in names:
+                conn.execute(text(BOOK_FULLTEXT_DDL))
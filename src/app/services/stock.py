@@ -0,0 +1,100 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+
+
+def order_quantities(items: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    """
+    Sum (book_id, quantity) pairs per book, so a book listed twice is reserved once.
+    """
+    quantities: Dict[int, int] = {}
+    for book_id, quantity in items:
+        quantities[book_id] = quantities.get(book_id, 0) + quantity
+    return quantities
+
+
+def reserve_stock(db: Session, books: Dict[int, Book], quantities: Dict[int, int]) -> None:
+    """
+    Atomically take quantities[book_id] units of stock from every book, or fail.
+
+    books are the rows already loaded by the caller (for prices); their stock is
+    only used to fail fast with a precise message. The reservation itself is one
+    conditional UPDATE for all books:
+        UPDATE book SET stock = stock - CASE book_id WHEN ... END
+        WHERE book_id IN (...) AND stock >= CASE book_id WHEN ... END
+    so the check and the decrement happen under each row's lock and concurrent
+    orders can't oversell. If fewer rows than books were updated, a concurrent
+    order took the stock first and a 400 is raised; the caller must roll back
+    its transaction (or savepoint), which still holds the partial update.
+    """
+    for book_id, quantity in quantities.items():
+        if books[book_id].stock < quantity:
+            raise HTTPException(status_code=400, detail=f"Not enough stock for book {books[book_id].title}")
+    if not quantities:
+        return
+
+    wanted = case(quantities, value=Book.book_id)
+    updated = (
+        db.query(Book)
+        .filter(Book.book_id.in_(list(quantities)), Book.stock >= wanted)
+        .update({Book.stock: Book.stock - wanted}, synchronize_session=False)
+    )
+    if updated != len(quantities):
+        raise HTTPException(status_code=400, detail="Not enough stock for one or more books")
+
+
+def release_stock(db: Session, quantities: Dict[int, int]) -> None:
+    """
+    Return quantities[book_id] units to every book in one UPDATE (caller commits).
+    """
+    if not quantities:
+        return
+    (
+        db.query(Book)
+        .filter(Book.book_id.in_(list(quantities)))
+        .update({Book.stock: Book.stock + case(quantities, value=Book.book_id)}, synchronize_session=False)
+    )
+
+
+def _unrestored_cancellations() -> Any:
+    # Orders canceled before cancel_order restored stock have no canceled_at
+    return (Order.status == OrderStatus.CANCELED) & Order.canceled_at.is_(None)
+
+
+def stock_drift(db: Session) -> List[Dict[str, Any]]:
+    """
+    Books whose stock is missing units of canceled orders that were never given
+    back, in one aggregate pass over order history. Each entry has the current
+    and expected stock and the drift (expected - current).
+    """
+    canceled = db.query(Order.order_id).filter(_unrestored_cancellations()).subquery()
+    rows = (
+        db.query(Book.book_id, Book.stock, func.sum(OrderItem.quantity))
+        .join(OrderItem, OrderItem.book_id == Book.book_id)
+        .join(canceled, canceled.c.order_id == OrderItem.order_id)
+        .group_by(Book.book_id, Book.stock)
+        .order_by(Book.book_id)
+    )
+    return [
+        {"book_id": book_id, "stock": stock, "expected_stock": stock + int(units), "drift": int(units)}
+        for book_id, stock, units in rows
+    ]
+
+
+def repair_drift(db: Session) -> int:
+    """
+    Give back the units found by stock_drift() and stamp canceled_at on those
+    orders so they aren't counted again, in one transaction. Returns the number
+    of books repaired.
+    """
+    drift = stock_drift(db)
+    release_stock(db, {row["book_id"]: row["drift"] for row in drift})
+    db.query(Order).filter(_unrestored_cancellations()).update({Order.canceled_at: func.now()}, synchronize_session=False)
+    db.commit()
+    return len(drift)
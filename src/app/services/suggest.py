@@ -0,0 +1,190 @@
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.book import Book, BookStatus
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.services.catalog import parse_names
+
+logger = logging.getLogger("api")
+
+# Only the first words of long titles get their own entry point
+MAX_WORDS = 8
+
+# Upper bound on index entries inspected per query (short prefixes match a lot)
+SCAN_LIMIT = 20000
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _word_starts(text: str) -> List[str]:
+    """
+    "Harry Potter" -> ["harry potter", "potter"], so any word can start a match.
+    """
+    words = _normalize(text).split(" ")
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORDS)) if words[i]]
+
+
+class SuggestIndex:
+    """
+    In-memory prefix index over book titles and authors for typeahead.
+
+    Entries are (term, book_id, author) tuples in a sorted list; a prefix is a
+    contiguous range found with bisect, and the top-k by popularity (reviews plus
+    units sold) is taken from that range. Mutations keep the list sorted and clear
+    the per-prefix result cache. Each process holds its own copy, rebuilt from the
+    database once it is older than SUGGEST_INDEX_MAX_AGE_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: List[Tuple[str, int, str]] = []
+        self._books: Dict[int, Tuple[str, List[str], int]] = {}
+        self._results: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.built_at is None or time.monotonic() - self.built_at > settings.SUGGEST_INDEX_MAX_AGE_SECONDS
+
+    def build(self, db: Session) -> None:
+        """
+        Load every available book plus its sales in two queries and swap the index in.
+        """
+        sold = dict(
+            db.query(OrderItem.book_id, func.sum(OrderItem.quantity))
+            .join(Order, Order.order_id == OrderItem.order_id)
+            .filter(Order.status != OrderStatus.CANCELED)
+            .group_by(OrderItem.book_id)
+        )
+        books: Dict[int, Tuple[str, List[str], int]] = {}
+        entries: List[Tuple[str, int, str]] = []
+        rows = (
+            db.query(Book.book_id, Book.title, Book.authors, Book.review_count)
+            .filter(Book.status == BookStatus.AVAILABLE)
+            .execution_options(yield_per=5000)
+        )
+        for book_id, title, authors, review_count in rows:
+            popularity = (review_count or 0) + int(sold.get(book_id) or 0)
+            books[book_id] = (title, parse_names(authors), popularity)
+            entries.extend(self._entries_for(book_id, title, books[book_id][1]))
+        entries.sort()
+        with self._lock:
+            self._books = books
+            self._entries = entries
+            self._results = {}
+            self.built_at = time.monotonic()
+        logger.info(f"Suggest index built: {len(books)} books, {len(entries)} entries")
+
+    @staticmethod
+    def _entries_for(book_id: int, title: str, authors: List[str]) -> List[Tuple[str, int, str]]:
+        entries = [(term, book_id, "") for term in _word_starts(title)]
+        for author in authors:
+            entries.extend((term, book_id, author) for term in _word_starts(author))
+        return entries
+
+    def add(self, book: Any) -> None:
+        """
+        Insert or refresh a book (title/authors/status may have changed).
+        """
+        with self._lock:
+            popularity = self._books.get(book.book_id, (None, None, 0))[2]
+            self._remove(book.book_id)
+            if book.status != BookStatus.AVAILABLE:
+                return
+            authors = parse_names(book.authors)
+            self._books[book.book_id] = (book.title, authors, popularity or book.review_count or 0)
+            for entry in self._entries_for(book.book_id, book.title, authors):
+                insort(self._entries, entry)
+            self._results.clear()
+
+    def invalidate(self) -> None:
+        """
+        Force a rebuild on the next query (after bulk writes).
+        """
+        with self._lock:
+            self.built_at = None
+
+    def remove(self, book_id: int) -> None:
+        with self._lock:
+            self._remove(book_id)
+
+    def bump(self, book_id: int, amount: int) -> None:
+        """
+        Raise a book's popularity (e.g. by the quantity just ordered).
+        """
+        with self._lock:
+            if book_id in self._books:
+                title, authors, popularity = self._books[book_id]
+                self._books[book_id] = (title, authors, popularity + amount)
+                self._results.clear()
+
+    def _remove(self, book_id: int) -> None:
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return
+        title, authors, _ = book
+        for entry in self._entries_for(book_id, title, authors):
+            i = bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+        self._results.clear()
+
+    def suggest(self, prefix: str, k: int) -> List[Dict[str, Any]]:
+        """
+        Top-k titles/authors starting (at any word) with prefix, most popular first.
+        """
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            cached = self._results.get((prefix, k))
+            if cached is not None:
+                return cached
+            # title -> (popularity, book_id); author -> best popularity among their books
+            titles: Dict[int, int] = {}
+            authors: Dict[str, int] = {}
+            i = bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), i + SCAN_LIMIT)
+            while i < end and self._entries[i][0].startswith(prefix):
+                _, book_id, author = self._entries[i]
+                popularity = self._books[book_id][2]
+                if author:
+                    authors[author] = max(authors.get(author, 0), popularity)
+                else:
+                    titles[book_id] = popularity
+                i += 1
+            candidates = [
+                (popularity, {"text": self._books[book_id][0], "type": "title", "book_id": book_id})
+                for book_id, popularity in titles.items()
+            ] + [
+                (popularity, {"text": author, "type": "author", "book_id": None})
+                for author, popularity in authors.items()
+            ]
+            top = heapq.nlargest(k, candidates, key=lambda c: (c[0], c[1]["type"] == "title"))
+            result = [suggestion for _, suggestion in top]
+            self._results[(prefix, k)] = result
+            return result
+
+
+suggest_index = SuggestIndex()
+
+
+def warm_up(db: Session) -> None:
+    """
+    Build the index at startup; failures are logged and the first query builds it instead.
+    """
+    try:
+        suggest_index.build(db)
+    except Exception as e:
+        logger.warning(f"Suggest index not built at startup: {e}")
@@ -0,0 +1,85 @@
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User, UserRole, UserStatus
+from app.models.book import Book, BookStatus
+from app.core.security import get_password_hash, create_access_token
+from app.services import catalog, sales
+
+def test_sales_rollups(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="analytics_admin@example.com",
+        password=get_password_hash("password"),
+        name="Analytics Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0020",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Analytics Book {i}",
+            authors="['Author']",
+            categories=categories,
+            publisher="Publisher",
+            isbn=f"analytics-{i}",
+            price=price,
+            stock=100,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i, (price, categories) in enumerate([(10000, "['Analytics', 'Data']"), (25000, "['Analytics']")])
+    ]
+    db.add(admin)
+    db.add_all(books)
+    db.commit()
+    catalog.sync_terms(db, books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    def order(*items):
+        r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json={
+            "items": [
+                {"book_id": book.book_id, "quantity": quantity, "unit_price": book.price, "subtotal": book.price * quantity}
+                for book, quantity in items
+            ],
+            "payment_method": "CARD",
+            "receiver_name": "Receiver",
+            "receiver_phone": "010-7777-0020",
+            "shipping_address": "Address"
+        })
+        assert r.status_code == 200
+        return r.json()
+
+    def report(group_by, **params):
+        r = client.get(f"{settings.API_V1_STR}/analytics/sales", headers=headers, params={"group_by": group_by, **params})
+        assert r.status_code == 200
+        return r.json()["rows"]
+
+    day = order((books[0], 2))["created_at"][:10]
+    before = {row["day"]: row for row in report("day")}.get(day, {"orders": 0, "units": 0, "revenue": 0})
+    order((books[0], 1), (books[1], 2))
+    canceled = order((books[1], 3))
+    client.patch(f"{settings.API_V1_STR}/orders/{canceled['order_id']}/cancel", headers=headers)
+
+    today = {row["day"]: row for row in report("day", date_from=day, date_to=day)}[day]
+    assert (today["orders"], today["units"], today["revenue"]) == (
+        before["orders"] + 1, before["units"] + 3, before["revenue"] + 60000
+    )
+    by_book = {row["book_id"]: row for row in report("book", date_from=day)}
+    assert (by_book[books[0].book_id]["units"], by_book[books[0].book_id]["revenue"]) == (3, 30000)
+    assert (by_book[books[1].book_id]["units"], by_book[books[1].book_id]["title"]) == (2, "Analytics Book 1")
+    by_category = {row["category"]: row for row in report("category", date_from=day)}
+    assert by_category["Analytics"]["revenue"] == 80000
+    assert by_category["Data"]["revenue"] == 30000
+
+    # The backfill rebuilds exactly what the incremental updates maintained
+    incremental = [report(group_by) for group_by in sales.GROUPINGS]
+    sales.rebuild(db)
+    assert [report(group_by) for group_by in sales.GROUPINGS] == incremental
+
+    r = client.get(f"{settings.API_V1_STR}/analytics/sales")
+    assert r.status_code == 401
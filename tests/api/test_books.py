@@ -1,10 +1,16 @@
+import json
 from datetime import datetime
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.book import Book, BookStatus
 from app.models.user import User, UserRole, UserStatus
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, create_access_token
+from app.services import catalog
+from app.core.pagination import count_cache, ESTIMATE_PAGES
+from app.core.cache import book_cache, response_cache
+from app.services.book_cache import get_book
+from app.services.suggest import suggest_index
 
 def test_read_books(client: TestClient, db: Session) -> None:
     # Create book
@@ -59,3 +65,472 @@ def test_read_book_not_found(client: TestClient) -> None:
     r = client.get(f"{settings.API_V1_STR}/books/99999")
     assert r.status_code == 404
     assert r.json()["code"] == "RESOURCE_NOT_FOUND"
+
+def test_read_books_cursor_pagination(client: TestClient, db: Session) -> None:
+    for i in range(5):
+        db.add(Book(
+            title=f"Cursor Book {i}",
+            authors="['Cursor Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"cursor-{i}",
+            price=7777,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        ))
+    db.commit()
+
+    for sort in ["created_at,desc", "price,asc", "summary,desc"]:
+        total = db.query(Book).filter(Book.status == BookStatus.AVAILABLE).count()
+        seen = []
+        cursor = ""
+        while True:
+            r = client.get(f"{settings.API_V1_STR}/books/", params={"cursor": cursor, "size": 2, "sort": sort})
+            assert r.status_code == 200
+            content = r.json()
+            seen.extend(b["book_id"] for b in content["content"])
+            if not content["hasNext"]:
+                break
+            cursor = content["nextCursor"]
+        assert len(seen) == len(set(seen)) == total
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+def test_keyword_search_index(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="search_admin@example.com",
+        password=get_password_hash("password"),
+        name="Search Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0001",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    db.add(admin)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    for isbn, title, summary in [
+        ("search-1", "Quantum Gardens", "Botany meets physics."),
+        ("search-2", "Gardening Basics", "A quantum of quantum tips for quantum gardeners."),
+    ]:
+        r = client.post(f"{settings.API_V1_STR}/books/", headers=headers, json={
+            "title": title,
+            "authors": "[\"Search Author\"]",
+            "categories": "[\"Science\"]",
+            "publisher": "Index Press",
+            "summary": summary,
+            "isbn": isbn,
+            "price": 10000,
+            "stock": 10,
+            "publication_date": "2023-01-01T00:00:00",
+            "subcategory": "General"
+        })
+        assert r.status_code == 200
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"keyword": "quantum"})
+    content = r.json()
+    assert [b["isbn"] for b in content["content"]] == ["search-2", "search-1"]
+    assert content["sort"] == "relevance,desc"
+
+    book_id = content["content"][0]["book_id"]
+    client.put(f"{settings.API_V1_STR}/books/{book_id}", headers=headers, json={"title": "Renamed Orchid"})
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"keyword": "orchid"})
+    assert [b["book_id"] for b in r.json()["content"]] == [book_id]
+
+    client.delete(f"{settings.API_V1_STR}/books/{book_id}", headers=headers)
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"keyword": "orchid"})
+    assert r.json()["content"] == []
+
+def test_category_and_author_filters(client: TestClient, db: Session) -> None:
+    for isbn, authors, categories in [
+        ("terms-1", "[\"Zed Writer\"]", "[\"Astronomy\"]"),
+        ("terms-2", "['Abe Writer', 'Zed Writer']", "['Astronomy Fiction']"),
+    ]:
+        db.add(Book(
+            title=f"Terms {isbn}",
+            authors=authors,
+            categories=categories,
+            publisher="Publisher",
+            isbn=isbn,
+            price=10000,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        ))
+    db.commit()
+    catalog.rebuild_book_terms(db, batch_size=2)
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"category": "Astronomy"})
+    assert [b["isbn"] for b in r.json()["content"]] == ["terms-1"]
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"author": "Zed Writer", "sort": "author,asc"})
+    content = r.json()["content"]
+    assert [b["isbn"] for b in content] == ["terms-2", "terms-1"]
+    assert content[0]["authors"] == "['Abe Writer', 'Zed Writer']"
+
+def test_read_books_count_modes(client: TestClient, db: Session) -> None:
+    url = f"{settings.API_V1_STR}/books/"
+    total = db.query(Book).filter(Book.status == BookStatus.AVAILABLE).count()
+    count_cache.clear()
+
+    r = client.get(url, params={"size": 2})
+    assert (r.json()["totalElements"], r.json()["countMode"]) == (total, "exact")
+    r = client.get(url, params={"size": 2, "page": 1})
+    assert (r.json()["totalElements"], r.json()["countMode"]) == (total, "cached")
+
+    r = client.get(url, params={"size": 1, "count": False})
+    assert r.json()["totalElements"] is None
+    assert r.json()["countMode"] == "none"
+    assert r.json()["hasNext"] is True
+
+    count_cache.clear()
+    r = client.get(url, params={"size": 1, "exact": False})
+    expected = ("estimate", ESTIMATE_PAGES) if total > ESTIMATE_PAGES else ("exact", total)
+    assert (r.json()["countMode"], r.json()["totalElements"]) == expected
+
+def test_book_response_cache_etag(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="cache_admin@example.com",
+        password=get_password_hash("password"),
+        name="Cache Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0002",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Cached Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="cache-1",
+        price=10000,
+        stock=10,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([admin, book])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+    url = f"{settings.API_V1_STR}/books/{book.book_id}"
+
+    hits = response_cache.hits
+    r = client.get(url)
+    etag = r.headers["etag"]
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert response_cache.hits == hits + 1
+
+    client.put(url, headers=headers, json={"price": 9000})
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["price"] == 9000
+    assert r.headers["etag"] != etag
+
+def test_read_books_sparse_fields(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"fields": "title,price"})
+    assert r.status_code == 200
+    content = r.json()
+    assert "totalElements" in content
+    assert set(content["content"][0]) == {"book_id", "title", "price"}
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"fields": "title,password"})
+    assert r.status_code == 400
+
+def test_bulk_import_books(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="import_admin@example.com",
+        password=get_password_hash("password"),
+        name="Import Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0003",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    db.add(admin)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    header = "title,authors,categories,publisher,summary,isbn,price,stock,cover_image,publication_date,subcategory\n"
+    rows = [
+        "Import One,\"[\"\"Importer\"\"]\",\"[\"\"Imports\"\"]\",Pub,,import-1,1000,5,,2023-01-01T00:00:00,General\n",
+        "Import Two,\"[\"\"Importer\"\"]\",\"[\"\"Imports\"\"]\",Pub,Second,import-2,2000,5,,2023-01-01T00:00:00,General\n",
+        "Import Dup,\"[\"\"Importer\"\"]\",\"[\"\"Imports\"\"]\",Pub,,import-1,1000,5,,2023-01-01T00:00:00,General\n",
+        "Import Bad,\"[\"\"Importer\"\"]\",\"[\"\"Imports\"\"]\",Pub,,import-3,free,5,,2023-01-01T00:00:00,General\n",
+        "Import Old,\"[\"\"Importer\"\"]\",\"[\"\"Imports\"\"]\",Pub,,1234567890,1000,5,,2023-01-01T00:00:00,General\n",
+    ]
+    r = client.post(
+        f"{settings.API_V1_STR}/books/import",
+        headers=headers,
+        params={"chunk_size": 2},
+        files={"file": ("books.csv", header + "".join(rows), "text/csv")},
+    )
+    assert r.status_code == 200
+    result = r.json()
+    assert result["imported"] == 2
+    assert [e["row"] for e in result["errors"]] == [3, 4, 5]
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"category": "Imports"})
+    assert {b["isbn"] for b in r.json()["content"]} == {"import-1", "import-2"}
+
+def test_read_books_batch(client: TestClient, db: Session) -> None:
+    books = [
+        Book(
+            title=f"Batch Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"batch-{i}",
+            price=10000,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=status
+        )
+        for i, status in enumerate([BookStatus.AVAILABLE, BookStatus.DELETED, BookStatus.SOLD_OUT])
+    ]
+    db.add_all(books)
+    db.commit()
+    available, deleted, sold_out = (b.book_id for b in books)
+
+    ids = f"{sold_out},99999,{deleted},{available},{sold_out}"
+    r = client.get(f"{settings.API_V1_STR}/books:batch", params={"ids": ids})
+    assert r.status_code == 200
+    content = r.json()
+    assert [b["book_id"] for b in content["content"]] == [sold_out, available]
+    assert content["missing"] == [99999]
+    assert content["deleted"] == [deleted]
+
+    r = client.get(f"{settings.API_V1_STR}/books:batch", params={"ids": "1,x"})
+    assert r.status_code == 400
+
+def test_read_books_facets(client: TestClient, db: Session) -> None:
+    for i, (price, categories) in enumerate([(5000, "['Facets', 'Poetry']"), (15000, "['Facets']"), (55000, "['Facets']")]):
+        db.add(Book(
+            title=f"Facet Book {i}",
+            authors="['Author']",
+            categories=categories,
+            publisher=f"Facet Press {i % 2}",
+            isbn=f"facet-{i}",
+            price=price,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        ))
+    db.commit()
+    catalog.rebuild_book_terms(db)
+
+    params = {"category": "Facets", "size": 1, "facets": "category,publisher,price"}
+    r = client.get(f"{settings.API_V1_STR}/books/", params=params)
+    assert r.status_code == 200
+    facets = r.json()["facets"]
+    assert facets["category"] == [{"value": "Facets", "count": 3}, {"value": "Poetry", "count": 1}]
+    assert facets["publisher"] == [{"value": "Facet Press 0", "count": 2}, {"value": "Facet Press 1", "count": 1}]
+    assert facets["price"] == [
+        {"value": "0-10000", "count": 1},
+        {"value": "10000-20000", "count": 1},
+        {"value": "50000+", "count": 1},
+    ]
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={**params, "page": 1})
+    assert r.json()["facets"] == facets
+
+def test_suggest_books(client: TestClient, db: Session) -> None:
+    books = [
+        Book(
+            title=title,
+            authors=authors,
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"suggest-{i}",
+            price=10000,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            review_count=review_count,
+            status=BookStatus.AVAILABLE
+        )
+        for i, (title, authors, review_count) in enumerate([
+            ("Zephyr Winds", "['Quinn Zephyrine']", 5),
+            ("The Zephyr Atlas", "['Ada Lane']", 50),
+            ("Hidden Zephyr", "['Ada Lane']", 0),
+        ])
+    ]
+    db.add_all(books)
+    db.commit()
+    suggest_index.invalidate()
+
+    r = client.get(f"{settings.API_V1_STR}/books/suggest", params={"q": "zeph", "k": 3})
+    assert r.status_code == 200
+    content = r.json()
+    # Any word of a title or author can start a match; most popular first
+    assert content[0] == {"text": "The Zephyr Atlas", "type": "title", "book_id": books[1].book_id}
+    assert {"text": "Quinn Zephyrine", "type": "author", "book_id": None} in content
+    assert len(content) == 3
+
+    suggest_index.remove(books[1].book_id)
+    r = client.get(f"{settings.API_V1_STR}/books/suggest", params={"q": "zeph"})
+    assert "The Zephyr Atlas" not in [s["text"] for s in r.json()]
+
+    r = client.get(f"{settings.API_V1_STR}/books/suggest", params={"q": ""})
+    assert r.status_code == 400
+
+def test_export_books(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="export_admin@example.com",
+        password=get_password_hash("password"),
+        name="Export Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0005",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Export Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"export-{i}",
+            price=10000,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=status
+        )
+        for i, status in enumerate([BookStatus.AVAILABLE, BookStatus.DELETED])
+    ]
+    db.add(admin)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    r = client.get(f"{settings.API_V1_STR}/books/export", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert "x-export-watermark" in r.headers
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    isbns = {row["isbn"] for row in rows}
+    assert "export-0" in isbns
+    assert "export-1" not in isbns # soft-deleted rows only with include_deleted/since
+    assert len(rows) == db.query(Book).filter(Book.status != BookStatus.DELETED).count()
+
+    r = client.get(f"{settings.API_V1_STR}/books/export", headers=headers, params={"format": "csv", "include_deleted": True})
+    assert r.status_code == 200
+    lines = r.text.splitlines()
+    assert lines[0].startswith("book_id,title,")
+    assert any("export-1" in line for line in lines[1:])
+
+    # Incremental: only books updated at or after since=
+    r = client.get(f"{settings.API_V1_STR}/books/export", headers=headers, params={"since": "2999-01-01T00:00:00"})
+    assert r.status_code == 200
+    assert r.text == ""
+
+    r = client.get(f"{settings.API_V1_STR}/books/export")
+    assert r.status_code == 401
+
+def test_book_entity_cache(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="entity_admin@example.com",
+        password=get_password_hash("password"),
+        name="Entity Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0006",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Entity Cached Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="entity-1",
+        price=10000,
+        stock=10,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([admin, book])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    hits, misses = book_cache.hits, book_cache.misses
+    assert get_book(db, book.book_id).price == 10000
+    assert get_book(db, book.book_id).price == 10000
+    assert (book_cache.hits, book_cache.misses) == (hits + 1, misses + 1)
+    assert get_book(db, 999999) is None
+
+    # Writes evict the entry, so the next read sees them
+    r = client.put(f"{settings.API_V1_STR}/books/{book.book_id}", headers=headers, json={"price": 8000})
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/books/{book.book_id}")
+    assert r.json()["price"] == 8000
+    client.delete(f"{settings.API_V1_STR}/books/{book.book_id}", headers=headers)
+    r = client.get(f"{settings.API_V1_STR}/books/{book.book_id}")
+    assert r.status_code == 404
+
+    r = client.get("/metrics")
+    assert r.json()["bookCache"]["hits"] >= hits + 1
+
+def test_read_books_price_and_rating_filters(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="range_admin@example.com",
+        password=get_password_hash("password"),
+        name="Range Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-9999-0007",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Range Book {i}",
+            authors="['Range Author']",
+            categories="['Rangeland']",
+            publisher="Publisher",
+            isbn=f"range-{i}",
+            price=price,
+            discount_rate=discount_rate,
+            average_rating=rating,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i, (price, discount_rate, rating) in enumerate([(20000, 50, 4.5), (15000, 0, 3.0), (40000, 10, 4.8)])
+    ]
+    db.add(admin)
+    db.add_all(books)
+    db.commit()
+    catalog.sync_terms(db, books)
+    db.commit()
+    assert [b.effective_price for b in books] == [10000, 15000, 36000]
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+
+    params = {"category": "Rangeland", "min_price": 9000, "max_price": 20000, "sort": "effective_price,asc"}
+    r = client.get(f"{settings.API_V1_STR}/books/", params=params)
+    assert r.status_code == 200
+    assert [b["isbn"] for b in r.json()["content"]] == ["range-0", "range-1"]
+
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"category": "Rangeland", "min_rating": 4.5})
+    assert {b["isbn"] for b in r.json()["content"]} == {"range-0", "range-2"}
+
+    # Changing the discount recomputes the sale price
+    r = client.put(f"{settings.API_V1_STR}/books/{books[1].book_id}", headers=headers, json={"discount_rate": 40})
+    assert r.json()["effective_price"] == 9000
+    r = client.get(f"{settings.API_V1_STR}/books/", params={"category": "Rangeland", "max_price": 9500})
+    assert [b["isbn"] for b in r.json()["content"]] == ["range-1"]
@@ -0,0 +1,245 @@
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User, UserRole, UserStatus
+from app.models.book import Book, BookStatus
+from app.models.cart import Cart, CartStatus
+from app.core.security import get_password_hash, create_access_token
+
+def test_add_item_to_cart_upsert(client: TestClient, db: Session) -> None:
+    user = User(
+        email="cart_user@example.com",
+        password=get_password_hash("password"),
+        name="Cart User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0022",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Cart Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="cart-1",
+        price=10000,
+        stock=10,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([user, book])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    url = f"{settings.API_V1_STR}/carts/items"
+
+    r = client.post(url, headers=headers, json={"book_id": book.book_id, "quantity": 2})
+    assert r.status_code == 200
+    r = client.post(url, headers=headers, json={"book_id": book.book_id, "quantity": 3})
+    assert r.status_code == 200
+    cart = r.json()
+    assert cart["total_amount"] == 50000
+    assert [(i["book_id"], i["quantity"], i["subtotal"]) for i in cart["items"]] == [(book.book_id, 5, 50000)]
+
+    # A removed line comes back with just the new quantity
+    r = client.delete(f"{url}/{book.book_id}", headers=headers)
+    assert r.status_code == 200
+    r = client.post(url, headers=headers, json={"book_id": book.book_id, "quantity": 1})
+    assert r.status_code == 200
+    assert [(i["quantity"], i["subtotal"]) for i in r.json()["items"]] == [(1, 10000)]
+
+    r = client.post(url, headers=headers, json={"book_id": 999999, "quantity": 1})
+    assert r.status_code == 404
+
+def test_update_cart_items_batch(client: TestClient, db: Session) -> None:
+    user = User(
+        email="cart_batch_user@example.com",
+        password=get_password_hash("password"),
+        name="Cart Batch User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0023",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Cart Batch Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"cart-batch-{i}",
+            price=1000 * (i + 1),
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i in range(3)
+    ]
+    db.add(user)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    url = f"{settings.API_V1_STR}/carts/items"
+    ids = [b.book_id for b in books]
+
+    r = client.post(url, headers=headers, json={"book_id": ids[0], "quantity": 1})
+    assert r.status_code == 200
+
+    r = client.patch(url, headers=headers, json={"operations": [
+        {"op": "add", "book_id": ids[0], "quantity": 2},
+        {"op": "add", "book_id": ids[1], "quantity": 1},
+        {"op": "set", "book_id": ids[1], "quantity": 4},
+        {"op": "add", "book_id": ids[2], "quantity": 1},
+        {"op": "remove", "book_id": ids[2]},
+    ]})
+    assert r.status_code == 200
+    cart = r.json()
+    assert [(i["book_id"], i["quantity"], i["subtotal"]) for i in cart["items"]] == [(ids[0], 3, 3000), (ids[1], 4, 8000)]
+    assert cart["total_amount"] == 11000
+
+    # One bad operation rejects the whole batch
+    r = client.patch(url, headers=headers, json={"operations": [
+        {"op": "remove", "book_id": ids[0]},
+        {"op": "set", "book_id": ids[2], "quantity": 1},
+    ]})
+    assert r.status_code == 404
+    r = client.patch(url, headers=headers, json={"operations": [{"op": "add", "book_id": ids[0]}]})
+    assert r.status_code == 400
+    r = client.get(f"{settings.API_V1_STR}/carts/", headers=headers)
+    assert r.json()["total_amount"] == 11000
+
+    # A removed line can be added back
+    r = client.patch(url, headers=headers, json={"operations": [{"op": "add", "book_id": ids[2], "quantity": 2}]})
+    assert r.status_code == 200
+    assert r.json()["total_amount"] == 17000
+
+def test_checkout_cart(client: TestClient, db: Session) -> None:
+    user = User(
+        email="checkout_user@example.com",
+        password=get_password_hash("password"),
+        name="Checkout User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0024",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Checkout Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"checkout-{i}",
+            price=10000,
+            stock=5,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i in range(3)
+    ]
+    db.add(user)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    checkout = {
+        "payment_method": "CARD",
+        "receiver_name": "Receiver",
+        "receiver_phone": "010-7777-0024",
+        "shipping_address": "Address"
+    }
+    url = f"{settings.API_V1_STR}/carts/checkout"
+
+    r = client.get(f"{settings.API_V1_STR}/carts/", headers=headers)
+    assert r.status_code == 200
+    r = client.post(url, headers=headers, json=checkout)
+    assert r.status_code == 400
+
+    r = client.patch(f"{settings.API_V1_STR}/carts/items", headers=headers, json={"operations": [
+        {"op": "add", "book_id": books[0].book_id, "quantity": 2},
+        {"op": "add", "book_id": books[1].book_id, "quantity": 1},
+        {"op": "add", "book_id": books[2].book_id, "quantity": 1},
+        {"op": "remove", "book_id": books[2].book_id},
+    ]})
+    assert r.status_code == 200
+    cart_id = r.json()["cart_id"]
+
+    r = client.post(url, headers=headers, json=checkout)
+    assert r.status_code == 200
+    order = r.json()
+    assert order["total_price"] == 30000
+    assert [(i["book_id"], i["quantity"]) for i in order["items"]] == [(books[0].book_id, 2), (books[1].book_id, 1)]
+    db.expire_all()
+    assert [b.stock for b in books] == [3, 4, 5]
+    assert db.get(Cart, cart_id).status == CartStatus.ORDERED
+
+    # The ordered cart is gone; the next cart starts empty
+    r = client.post(url, headers=headers, json=checkout)
+    assert r.status_code == 404
+    r = client.get(f"{settings.API_V1_STR}/carts/", headers=headers)
+    assert r.json()["cart_id"] != cart_id
+
+    # Out of stock: nothing is ordered and the cart stays active
+    r = client.post(f"{settings.API_V1_STR}/carts/items", headers=headers, json={"book_id": books[0].book_id, "quantity": 9})
+    new_cart_id = r.json()["cart_id"]
+    r = client.post(url, headers=headers, json=checkout)
+    assert r.status_code == 400
+    db.expire_all()
+    assert db.get(Cart, new_cart_id).status == CartStatus.ACTIVE
+    assert books[0].stock == 3
+
+def test_read_cart_items_expanded(client: TestClient, db: Session) -> None:
+    user = User(
+        email="cart_view_user@example.com",
+        password=get_password_hash("password"),
+        name="Cart View User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0025",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Cart View Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"cart-view-{i}",
+            price=10000,
+            stock=7,
+            cover_image=f"http://example.com/{i}.jpg",
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i in range(3)
+    ]
+    db.add(user)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    url = f"{settings.API_V1_STR}/carts/items"
+
+    r = client.patch(url, headers=headers, json={"operations": [
+        {"op": "add", "book_id": b.book_id, "quantity": 1} for b in books
+    ] + [{"op": "remove", "book_id": books[2].book_id}]})
+    assert r.status_code == 200
+    books[1].price = 12000
+    db.commit()
+
+    r = client.get(url, headers=headers)
+    assert [i["bookId"] for i in r.json()["payload"]] == [books[0].book_id, books[1].book_id]
+
+    r = client.get(url, headers=headers, params={"expand": True})
+    assert r.status_code == 200
+    payload = r.json()["payload"]
+    assert [(i["bookId"], i["title"], i["coverImage"], i["stock"]) for i in payload] == [
+        (b.book_id, b.title, b.cover_image, 7) for b in books[:2]
+    ]
+    assert [(i["unitPrice"], i["price"], i["priceChanged"]) for i in payload] == [(10000, 10000, False), (10000, 12000, True)]
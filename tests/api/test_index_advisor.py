@@ -0,0 +1,9 @@
+from sqlalchemy.orm import Session
+
+from app.db.index_advisor import advise
+
+
+def test_hot_queries_use_indexes(db: Session) -> None:
+    report = advise(db)
+    flagged = {name: problems for name, (_, problems) in report.items() if problems}
+    assert flagged == {}
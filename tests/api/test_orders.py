@@ -1,10 +1,19 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.user import User, UserRole, UserStatus
 from app.models.book import Book, BookStatus
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.schemas.order import OrderCreate
 from app.core.security import get_password_hash, create_access_token
+from app.services import stock
+from app.services.order_queue import OrderQueue
+from app.services.stock import reserve_stock
 
 def test_create_order(client: TestClient, db: Session) -> None:
     # Create user
@@ -80,3 +89,404 @@ def test_read_orders(client: TestClient, db: Session) -> None:
     content = r.json()
     assert "content" in content
     assert len(content["content"]) == 0 # No orders yet
+
+def test_create_order_stock_reservation(client: TestClient, db: Session) -> None:
+    user = User(
+        email="stock_user@example.com",
+        password=get_password_hash("password"),
+        name="Stock User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0015",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Stock Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"stock-{i}",
+            price=10000,
+            stock=3,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i in range(2)
+    ]
+    db.add(user)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+
+    def order(*items):
+        return client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json={
+            "items": [
+                {"book_id": book.book_id, "quantity": quantity, "unit_price": 10000, "subtotal": 10000 * quantity}
+                for book, quantity in items
+            ],
+            "payment_method": "CARD",
+            "receiver_name": "Receiver",
+            "receiver_phone": "010-7777-0015",
+            "shipping_address": "Address"
+        })
+
+    def stocks():
+        db.expire_all()
+        return [book.stock for book in books]
+
+    r = order((books[0], 2), (books[1], 1))
+    assert r.status_code == 200
+    assert stocks() == [1, 2]
+
+    # All or nothing: the second book is short, so the first isn't decremented either
+    r = order((books[1], 1), (books[0], 2))
+    assert r.status_code == 400
+    assert stocks() == [1, 2]
+
+    # Lines for the same book are reserved together
+    r = order((books[1], 1), (books[1], 2))
+    assert r.status_code == 400
+    assert stocks() == [1, 2]
+
+
+def test_reserve_stock_lost_race(db: Session) -> None:
+    book = Book(
+        title="Race Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="race-1",
+        price=10000,
+        stock=5,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add(book)
+    db.commit()
+    assert book.stock == 5
+    # Stock drops after the book was loaded, so only the conditional UPDATE can catch it
+    db.query(Book).filter(Book.book_id == book.book_id).update({Book.stock: 1}, synchronize_session=False)
+
+    with pytest.raises(HTTPException) as exc:
+        reserve_stock(db, {book.book_id: book}, {book.book_id: 3})
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Not enough stock for one or more books"
+    db.rollback()
+
+
+def test_create_order_idempotency_key(client: TestClient, db: Session) -> None:
+    user = User(
+        email="idempotent_user@example.com",
+        password=get_password_hash("password"),
+        name="Idempotent User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0016",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Idempotent Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="idempotent-1",
+        price=10000,
+        stock=5,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([user, book])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}", "Idempotency-Key": "retry-1"}
+    order_data = {
+        "items": [{"book_id": book.book_id, "quantity": 2, "unit_price": 10000, "subtotal": 20000}],
+        "payment_method": "CARD",
+        "receiver_name": "Receiver",
+        "receiver_phone": "010-7777-0016",
+        "shipping_address": "Address"
+    }
+
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=order_data)
+    assert r.status_code == 200
+    first = r.json()
+
+    # A retry replays the stored response without ordering again
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=order_data)
+    assert r.status_code == 200
+    assert r.headers["idempotent-replayed"] == "true"
+    assert r.json() == first
+    db.expire_all()
+    assert book.stock == 3
+
+    # Same key, different body
+    order_data["items"][0]["quantity"] = 1
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=order_data)
+    assert r.status_code == 422
+
+    # A new key orders again
+    headers["Idempotency-Key"] = "retry-2"
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=order_data)
+    assert r.status_code == 200
+    assert r.json()["order_id"] != first["order_id"]
+
+
+def test_read_orders_keyset_and_filters(client: TestClient, db: Session) -> None:
+    user = User(
+        email="order_pages_user@example.com",
+        password=get_password_hash("password"),
+        name="Order Pages User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0017",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Paged Order Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="paged-order-1",
+        price=10000,
+        stock=100,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([user, book])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    for quantity in range(1, 6):
+        r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json={
+            "items": [{"book_id": book.book_id, "quantity": quantity, "unit_price": 10000, "subtotal": 10000 * quantity}],
+            "payment_method": "CARD",
+            "receiver_name": "Receiver",
+            "receiver_phone": "010-7777-0017",
+            "shipping_address": "Address"
+        })
+        assert r.status_code == 200
+    client.patch(f"{settings.API_V1_STR}/orders/{r.json()['order_id']}/cancel", headers=headers)
+
+    seen = []
+    params = {"size": 2, "cursor": ""}
+    while True:
+        r = client.get(f"{settings.API_V1_STR}/orders/", headers=headers, params=params)
+        assert r.status_code == 200
+        content = r.json()
+        seen.extend(content["content"])
+        if not content["hasNext"]:
+            break
+        params["cursor"] = content["nextCursor"]
+    # Newest first, every order once, items loaded
+    assert [o["items"][0]["quantity"] for o in seen] == [5, 4, 3, 2, 1]
+
+    r = client.get(f"{settings.API_V1_STR}/orders/", headers=headers, params={"status": "CANCELED"})
+    assert [o["items"][0]["quantity"] for o in r.json()["content"]] == [5]
+    r = client.get(f"{settings.API_V1_STR}/orders/", headers=headers, params={"created_from": "2999-01-01T00:00:00"})
+    assert r.json()["content"] == []
+
+
+def test_bulk_update_order_status(client: TestClient, db: Session) -> None:
+    admin = User(
+        email="fulfillment_admin@example.com",
+        password=get_password_hash("password"),
+        name="Fulfillment Admin",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0018",
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE
+    )
+    db.add(admin)
+    db.commit()
+    orders = [
+        Order(
+            user_id=admin.user_id,
+            payment_method="CARD",
+            receiver_name="Receiver",
+            receiver_phone="010-7777-0018",
+            shipping_address="Address",
+            total_price=10000,
+            final_price=10000,
+            status=status
+        )
+        for status in [OrderStatus.PAID, OrderStatus.PAID, OrderStatus.CREATED, OrderStatus.SHIPPED]
+    ]
+    db.add_all(orders)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(admin.user_id)}"}
+    ids = [order.order_id for order in orders]
+
+    r = client.post(f"{settings.API_V1_STR}/orders/bulk-status", headers=headers, json={
+        "order_ids": ids + [999999],
+        "status": "SHIPPED"
+    })
+    assert r.status_code == 200
+    content = r.json()
+    assert content["updated"] == 2
+    assert [(x["result"], x["status"]) for x in content["results"]] == [
+        ("updated", "SHIPPED"),
+        ("updated", "SHIPPED"),
+        ("invalid_transition", "CREATED"),
+        ("unchanged", "SHIPPED"),
+        ("not_found", None),
+    ]
+    db.expire_all()
+    assert orders[0].shipped_at is not None
+    assert orders[2].shipped_at is None
+
+    r = client.post(f"{settings.API_V1_STR}/orders/bulk-status", headers=headers, json={"order_ids": ids, "status": "CANCELED"})
+    assert r.status_code == 400
+
+
+def test_cancel_order_restores_stock(client: TestClient, db: Session) -> None:
+    user = User(
+        email="cancel_user@example.com",
+        password=get_password_hash("password"),
+        name="Cancel User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0019",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    books = [
+        Book(
+            title=f"Cancel Book {i}",
+            authors="['Author']",
+            categories="['Fiction']",
+            publisher="Publisher",
+            isbn=f"cancel-{i}",
+            price=10000,
+            stock=10,
+            publication_date=datetime(2023, 1, 1),
+            subcategory="General",
+            status=BookStatus.AVAILABLE
+        )
+        for i in range(2)
+    ]
+    db.add(user)
+    db.add_all(books)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json={
+        "items": [
+            {"book_id": books[0].book_id, "quantity": 2, "unit_price": 10000, "subtotal": 20000},
+            {"book_id": books[1].book_id, "quantity": 3, "unit_price": 10000, "subtotal": 30000},
+            {"book_id": books[0].book_id, "quantity": 1, "unit_price": 10000, "subtotal": 10000},
+        ],
+        "payment_method": "CARD",
+        "receiver_name": "Receiver",
+        "receiver_phone": "010-7777-0019",
+        "shipping_address": "Address"
+    })
+    order_id = r.json()["order_id"]
+    db.expire_all()
+    assert [b.stock for b in books] == [7, 7]
+
+    r = client.patch(f"{settings.API_V1_STR}/orders/{order_id}/cancel", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["status"] == "CANCELED"
+    db.expire_all()
+    assert [b.stock for b in books] == [10, 10]
+    assert db.get(Order, order_id).canceled_at is not None
+
+    r = client.patch(f"{settings.API_V1_STR}/orders/{order_id}/cancel", headers=headers)
+    assert r.status_code == 409
+    db.expire_all()
+    assert [b.stock for b in books] == [10, 10]
+
+    # An order canceled before stock was restored shows up as drift until repaired
+    legacy = Order(
+        user_id=user.user_id,
+        payment_method="CARD",
+        receiver_name="Receiver",
+        receiver_phone="010-7777-0019",
+        shipping_address="Address",
+        total_price=40000,
+        final_price=40000,
+        status=OrderStatus.CANCELED
+    )
+    db.add(legacy)
+    db.flush()
+    db.add(OrderItem(order_id=legacy.order_id, book_id=books[1].book_id, quantity=4, unit_price=10000, subtotal=40000))
+    db.commit()
+    drift = {row["book_id"]: row for row in stock.stock_drift(db)}
+    assert drift[books[1].book_id]["expected_stock"] == 14
+    assert books[0].book_id not in drift
+    stock.repair_drift(db)
+    db.expire_all()
+    assert books[1].stock == 14
+    assert stock.stock_drift(db) == []
+
+
+def test_order_ingest_queue(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    user = User(
+        email="ingest_user@example.com",
+        password=get_password_hash("password"),
+        name="Ingest User",
+        birth_date=datetime(1990, 1, 1),
+        gender="MALE",
+        phone_number="010-7777-0021",
+        role=UserRole.USER,
+        status=UserStatus.ACTIVE
+    )
+    book = Book(
+        title="Ingest Book",
+        authors="['Author']",
+        categories="['Fiction']",
+        publisher="Publisher",
+        isbn="ingest-1",
+        price=10000,
+        stock=5,
+        publication_date=datetime(2023, 1, 1),
+        subcategory="General",
+        status=BookStatus.AVAILABLE
+    )
+    db.add_all([user, book])
+    db.commit()
+
+    def order(quantity: int) -> OrderCreate:
+        return OrderCreate(
+            items=[{"book_id": book.book_id, "quantity": quantity, "unit_price": 10000, "subtotal": 10000 * quantity}],
+            payment_method="CARD",
+            receiver_name="Receiver",
+            receiver_phone="010-7777-0021",
+            shipping_address="Address"
+        )
+
+    # Three callers land in one batch; the one that doesn't fit fails alone
+    queue = OrderQueue(max_batch=3, max_wait_ms=2000)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(queue.submit, db, user.user_id, order(quantity)) for quantity in (2, 9, 3)]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result().total_price)
+            except HTTPException as e:
+                results.append(e.status_code)
+    assert sorted(results) == [400, 20000, 30000]
+    assert queue.stats()["batches"] == 1
+    assert queue.stats()["orders"] == 2
+    db.expire_all()
+    assert book.stock == 0
+    assert db.query(Order).filter(Order.user_id == user.user_id).count() == 2
+
+    # Through the API: same response shape, errors surface as usual
+    monkeypatch.setattr(settings, "ORDER_INGEST_QUEUE_ENABLED", True)
+    headers = {"Authorization": f"Bearer {create_access_token(user.user_id)}"}
+    db.query(Book).filter(Book.book_id == book.book_id).update({Book.stock: 1})
+    db.commit()
+    payload = order(1).model_dump(mode="json")
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=payload)
+    assert r.status_code == 200
+    assert r.json()["total_price"] == 10000
+    assert [item["quantity"] for item in r.json()["items"]] == [1]
+    r = client.post(f"{settings.API_V1_STR}/orders/", headers=headers, json=payload)
+    assert r.status_code == 400